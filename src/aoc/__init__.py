@@ -1,11 +1,17 @@
 import logging
 from enum import Enum
-from os import get_terminal_size
+from pathlib import Path
 from pprint import pformat
-from typing import ClassVar
+from shutil import get_terminal_size
+from types import FunctionType, MethodType
+from typing import TYPE_CHECKING, ClassVar
 
 from yachalk import chalk
 
+if TYPE_CHECKING:
+    from aoc.cache import AnswerCache, ParseCache
+    from aoc.search import SearchStats
+
 
 class InputMode(Enum):
     PUZZLE = "puzzle"
@@ -16,6 +22,9 @@ class InputMode(Enum):
 class LogFormatter(logging.Formatter):
     def format(self, record):
         prefix = "" if record.name == "root" else "[%(name)s] "
+        if isinstance(record.msg, FunctionType | MethodType):
+            # Deferred message, e.g. logging.debug(lambda: grid.to_str(...)): only computed when it's actually logged.
+            record.msg = record.msg()
         if record.levelno < logging.WARNING and not prefix:
             # Debugging & info: just print the raw message (which could already be formatted)
             if isinstance(record.msg, str):
@@ -37,6 +46,15 @@ class LogFormatter(logging.Formatter):
 class AOC:
     input_mode: ClassVar[InputMode]
     debugging: ClassVar[bool] = False
+    parse_cache: ClassVar["ParseCache | None"] = None
+    measure_memory: ClassVar[bool] = False
+    answer_cache: ClassVar["AnswerCache | None"] = None
+    # Read this file instead of the regular input (of the current input mode).
+    input_path: ClassVar[Path | None] = None
+    # Memory map the input file for problems that can process it as a stream of lines.
+    streaming_input: ClassVar[bool] = False
+    # Statistics of all searches (of aoc.search) done so far, only collected when this is a list.
+    search_stats: ClassVar["list[SearchStats] | None"] = None
 
     @classmethod
     def setup(cls, input_mode: InputMode, debugging: bool):
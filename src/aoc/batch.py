@@ -0,0 +1,236 @@
+import logging
+import os
+import re
+import resource
+import signal
+from collections import Counter, deque
+from collections.abc import Iterable
+from importlib import import_module
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import monotonic, perf_counter_ns
+from typing import NamedTuple
+
+from yachalk import chalk
+
+from aoc import AOC, InputMode
+from aoc.cache import AnswerCache, ParseCache, source_key
+from aoc.problems import Outcome, Problem, Result
+from aoc.utils import group_by, human_readable_duration, log_table
+
+OUTCOME_COLORS = {
+    Outcome.CORRECT: "0c6",
+    Outcome.WRONG: "f30",
+    Outcome.ATTEMPTED: "0af",
+    Outcome.NO_SOLUTION: "f80",
+    Outcome.ERROR: "f30",
+    Outcome.TIMEOUT: "f30",
+    Outcome.OOM: "f30",
+}
+
+FAILURES = (Outcome.WRONG, Outcome.ERROR, Outcome.TIMEOUT, Outcome.OOM)
+
+
+def discover(years: Iterable[int] | None = None, parts: Iterable[int] = (1, 2)) -> list[Problem.Data]:
+    """Find all day modules in the aoc package, without importing them."""
+    root = Path(__file__).parent
+    years = set(years) if years else None
+    return sorted(
+        Problem.Data(int(y.name[4:]), int(d.stem[3:]), part)
+        for y in root.iterdir() if re.fullmatch(r"year\d{4}", y.name) and (years is None or int(y.name[4:]) in years)
+        for d in y.glob("day[0-9][0-9].py")
+        for part in parts
+    )
+
+
+def problem_class(data: Problem.Data) -> type[Problem] | None:
+    module = import_module(f"aoc.year{data.year}.day{data.day:02d}")
+    return getattr(module, f"Problem{data.part}", None)
+
+
+class BatchOptions(NamedTuple):
+    # Number of parts solved in parallel (default: one per core)
+    workers: int | None = None
+    # Directory to persist parsed inputs in (by default they are only shared between the parts of a day)
+    parse_cache_dir: Path | None = None
+    measure_memory: bool = False
+    # Wall clock time (in seconds) a part may take
+    timeout: float | None = None
+    # Address space (in bytes) a part may use
+    max_memory: int | None = None
+    answer_cache: AnswerCache | None = None
+
+
+def _init_worker(input_mode: InputMode, options: BatchOptions) -> None:
+    AOC.input_mode = input_mode
+    AOC.parse_cache = ParseCache(options.parse_cache_dir)
+    AOC.measure_memory = options.measure_memory
+    AOC.answer_cache = options.answer_cache
+    # Keep the output of the individual days from messing up the summary.
+    logging.getLogger().setLevel(logging.WARNING)
+    if options.max_memory:
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (options.max_memory, options.max_memory))
+        except (ValueError, OSError) as exc:
+            logging.warning("Could not limit memory: %s", exc)
+
+
+def run_part(data: Problem.Data) -> Result | None:
+    try:
+        problem_cls = problem_class(data)
+        if problem_cls is None:
+            return None
+        return problem_cls.run(*data)
+    except MemoryError:
+        return Result(data, AOC.input_mode, Outcome.OOM, error="MemoryError")
+    except Exception as exc:  # noqa: BLE001
+        return Result(data, AOC.input_mode, Outcome.ERROR, error=f"{type(exc).__name__}: {exc}")
+
+
+def _run_isolated(data: Problem.Data, conn: Connection, input_mode: InputMode, options: BatchOptions) -> None:
+    _init_worker(input_mode, options)
+    conn.send(run_part(data))
+    conn.close()
+
+
+class _Job:
+    """Solves the parts of a day one after the other, each in a process of its own."""
+
+    def __init__(self, parts: list[Problem.Data], input_mode: InputMode, options: BatchOptions):
+        self.parts = deque(parts)
+        self.input_mode = input_mode
+        self.options = options
+        self.start_next()
+
+    def start_next(self) -> None:
+        self.data = self.parts.popleft()
+        try:
+            # Import the day (and hash its sources) once, so (forked) children don't each have to.
+            problem_cls = problem_class(self.data)
+            if problem_cls and self.options.answer_cache:
+                source_key(problem_cls.__module__)
+        except Exception:  # noqa: BLE001, S110 (the child will report it)
+            pass
+        self.conn, child_conn = Pipe(duplex=False)
+        self.process = Process(
+            target=_run_isolated, args=(self.data, child_conn, self.input_mode, self.options), daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.deadline = monotonic() + self.options.timeout if self.options.timeout else None
+        self.result: Result | None = None
+
+    def receive(self) -> None:
+        try:
+            self.result = self.conn.recv()
+        except EOFError:
+            # Died without sending anything
+            self.result = None
+
+    def finish(self) -> Result | None:
+        self.process.join()
+        self.conn.close()
+        if self.result is not None or self.process.exitcode == 0:
+            # A day module without this part
+            return self.result
+        if self.process.exitcode == -signal.SIGKILL:
+            # Most likely the OOM killer (a MemoryError would have been reported by the part itself)
+            return Result(self.data, self.input_mode, Outcome.OOM, error="killed")
+        return Result(self.data, self.input_mode, Outcome.ERROR, error=f"exit code {self.process.exitcode}")
+
+    def kill(self) -> Result:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        return Result(self.data, self.input_mode, Outcome.TIMEOUT, error=f"killed after {self.options.timeout} s")
+
+
+def run_batch(parts: list[Problem.Data], input_mode: InputMode, options: BatchOptions) -> list[Result]:
+    """
+    Solve all given parts, a number of them in parallel (one per core by default).
+    Every part runs in a child process of its own, which is killed when it exceeds the time limit.
+    The parts of a day are solved one after the other, so they can share the parsed input.
+    """
+    days = deque(group_by(parts, key=lambda data: (data.year, data.day)).values())
+    workers = options.workers or os.cpu_count() or 1
+    results: list[Result] = []
+    running: list[_Job] = []
+    with TemporaryDirectory() as tmp_dir:
+        if options.parse_cache_dir is None:
+            options = options._replace(parse_cache_dir=Path(tmp_dir))
+        while days or running:
+            while days and len(running) < workers:
+                running.append(_Job(days.popleft(), input_mode, options))
+            deadlines = [job.deadline for job in running if job.deadline is not None]
+            ready = set(wait(
+                [job.conn for job in running if job.result is None] + [job.process.sentinel for job in running],
+                timeout=max(0.0, min(deadlines) - monotonic()) if deadlines else None,
+            ))
+            for job in running[:]:
+                if job.conn in ready and job.result is None:
+                    job.receive()
+                if job.process.sentinel in ready:
+                    result = job.finish()
+                elif job.deadline is not None and monotonic() >= job.deadline:
+                    result = job.kill()
+                else:
+                    continue
+                if result:
+                    results.append(result)
+                if job.parts:
+                    job.start_next()
+                else:
+                    running.remove(job)
+    return sorted(results, key=lambda result: result.data)
+
+
+def _answer(result: Result) -> str:
+    if result.error:
+        text = result.error
+    elif result.solution is None:
+        text = ""
+    else:
+        text = " ".join(str(result.solution).strip().splitlines())
+    return text if len(text) <= 40 else f"{text[:39]}…"
+
+
+def report(results: list[Result], wall_time: int) -> None:
+    memory = any(result.memory for result in results)
+    rows: list[list[object]] = [[
+        "Year", "Day", "Part", "Outcome", "Answer", "Time", *(["Init memory", "Solution memory"] if memory else []),
+    ]]
+    for result in results:
+        outcome = f"{result.outcome.emoji} {result.outcome.value}"
+        rows.append([
+            result.data.year,
+            result.data.day,
+            result.data.part,
+            (chalk.hex(OUTCOME_COLORS[result.outcome])(outcome), len(outcome) + 1),
+            _answer(result),
+            (human_readable_duration(result.duration) + (" (cached)" if result.cached else "")) if (
+                result.duration
+            ) else "",
+            *([str(m) for m in result.memory] if result.memory else ["", ""] if memory else []),
+        ])
+    log_table(rows)
+    counts = Counter(result.outcome for result in results)
+    cached = sum(result.cached for result in results)
+    logging.info(" ")
+    logging.info(
+        " Solved %d parts in %s (%s of solving time%s): %s",
+        len(results),
+        human_readable_duration(wall_time),
+        human_readable_duration(sum(result.duration for result in results if not result.cached)),
+        f", {cached} answers from the cache" if cached else "",
+        ", ".join(f"{counts[outcome]} {outcome.value}" for outcome in Outcome if counts[outcome]),
+    )
+
+
+def solve_all(parts: list[Problem.Data], input_mode: InputMode, options: BatchOptions) -> bool:
+    """Run a batch of parts in parallel and report on them. Returns whether all parts went fine."""
+    start = perf_counter_ns()
+    results = run_batch(parts, input_mode, options)
+    report(results, perf_counter_ns() - start)
+    return not any(result.outcome in FAILURES for result in results)
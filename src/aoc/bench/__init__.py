@@ -0,0 +1,127 @@
+import gc
+import json
+import logging
+import statistics
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import NamedTuple, Self
+
+from aoc import AOC
+from aoc.problems import Durations, FatalError, Outcome, Problem
+from aoc.utils import human_readable_duration, log_table
+
+
+class Stats(NamedTuple):
+    samples: int
+    minimum: int
+    median: int
+    p95: int
+    stddev: int
+
+    @classmethod
+    def of(cls, samples: list[int]) -> Self:
+        p95 = statistics.quantiles(samples, n=20, method="inclusive")[-1] if len(samples) > 1 else samples[0]
+        stddev = statistics.stdev(samples) if len(samples) > 1 else 0
+        return cls(len(samples), min(samples), round(statistics.median(samples)), round(p95), round(stddev))
+
+    def as_dict(self) -> dict[str, int]:
+        return self._asdict()
+
+    @property
+    def durations(self) -> list[str]:
+        return [human_readable_duration(ns) for ns in (self.minimum, self.median, self.p95, self.stddev)]
+
+
+class Benchmark(NamedTuple):
+    data: Problem.Data
+    input: Stats
+    solution: Stats
+    phases: dict[str, Stats]
+
+    def as_dict(self) -> dict[str, object]:
+        return self.data._asdict() | {
+            "input": self.input.as_dict(),
+            "solution": self.solution.as_dict(),
+            "phases": {phase: stats.as_dict() for phase, stats in self.phases.items()},
+        }
+
+
+@contextmanager
+def _quiet() -> Iterator[None]:
+    logger = logging.getLogger()
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+def benchmark(problem_cls: type[Problem], data: Problem.Data, repetitions: int, warmup: int = 1) -> Benchmark:
+    """
+    Build the problem and call its solution repeatedly, after a couple of warmup runs.
+    Every repetition gets a fresh problem instance, since some solutions mutate their state.
+    """
+    samples: list[Durations] = []
+    with _quiet():
+        for i in range(warmup + repetitions):
+            gc.collect()
+            result = problem_cls.run(*data)
+            if result.outcome in (Outcome.NO_SOLUTION, Outcome.ERROR):
+                raise FatalError(result.error or "No solution found!")
+            if i >= warmup:
+                samples.append(result.durations)
+    return Benchmark(
+        data,
+        Stats.of([d.read + d.process_input + d.init for d in samples]),
+        Stats.of([d.solution for d in samples]),
+        {phase: Stats.of(list(durations)) for phase, durations in zip(Durations._fields, zip(*samples, strict=True), strict=True)},
+    )
+
+
+def benchmark_all(
+    parts: list[Problem.Data],
+    repetitions: int,
+    warmup: int = 1,
+) -> list[Benchmark]:
+    """Benchmark parts one after another, running them in parallel would only skew the numbers."""
+    from aoc.batch import problem_class
+
+    benchmarks = []
+    for data in parts:
+        try:
+            problem_cls = problem_class(data)
+            if problem_cls is None:
+                continue
+            benchmarks.append(benchmark(problem_cls, data, repetitions, warmup))
+        except FatalError as exc:
+            logging.warning("Skipping %d day %d part %d: %s", *data, exc.message)
+        except Exception as exc:  # noqa: BLE001
+            logging.warning("Skipping %d day %d part %d: %s: %s", *data, type(exc).__name__, exc)
+    return benchmarks
+
+
+def report(benchmarks: list[Benchmark]) -> None:
+    log_table([
+        ["Year", "Day", "Part", "Input min", "median", "p95", "stddev", "Solution min", "median", "p95", "stddev"],
+        *([*b.data, *b.input.durations, *b.solution.durations] for b in benchmarks),
+    ])
+
+
+def write_json(benchmarks: list[Benchmark], path: Path, repetitions: int, warmup: int) -> None:
+    with path.open("w", encoding="utf8") as f:
+        json.dump({
+            "input_mode": AOC.input_mode.value,
+            "repetitions": repetitions,
+            "warmup": warmup,
+            "parts": {b.data.key: b.as_dict() for b in benchmarks},
+        }, f, indent=2)
+
+
+def bench(parts: list[Problem.Data], repetitions: int, warmup: int, output: Path) -> None:
+    benchmarks = benchmark_all(parts, repetitions, warmup)
+    report(benchmarks)
+    write_json(benchmarks, output, repetitions, warmup)
+    logging.info(" ")
+    logging.info(" Wrote %d benchmarks to %s", len(benchmarks), output)
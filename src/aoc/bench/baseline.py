@@ -0,0 +1,104 @@
+import json
+import logging
+from pathlib import Path
+from typing import NamedTuple
+
+from yachalk import chalk
+
+from aoc import AOC, InputMode
+from aoc.bench import Benchmark
+from aoc.problems import Problem
+from aoc.utils import human_readable_duration, log_table
+
+
+class Comparison(NamedTuple):
+    data: Problem.Data
+    baseline: int | None
+    median: int
+    max_ratio: float
+    min_duration: int
+
+    @property
+    def ratio(self) -> float | None:
+        return self.median / self.baseline if self.baseline else None
+
+    @property
+    def is_regression(self) -> bool:
+        # Very short runs are too noisy to compare, so never blame anything below the minimum duration.
+        return self.baseline is not None and self.median > max(self.baseline, self.min_duration) * self.max_ratio
+
+
+def _median(b: Benchmark) -> int:
+    return b.input.median + b.solution.median
+
+
+def baseline_input_mode(path: Path) -> InputMode:
+    """The input mode a baseline file was made with."""
+    with path.open(encoding="utf8") as f:
+        return InputMode(json.load(f)["input_mode"])
+
+
+def load_baseline(path: Path, input_mode: InputMode | None = None) -> dict[str, int]:
+    """
+    Read the per-part median timings (input processing + solution) from a baseline file,
+    which should have been made with the input mode (by default the current one).
+    """
+    input_mode = input_mode or AOC.input_mode
+    with path.open(encoding="utf8") as f:
+        baseline = json.load(f)
+    if baseline["input_mode"] != input_mode.value:
+        msg = f"Baseline {path} was made with {baseline['input_mode']} input, not {input_mode.value} input."
+        raise ValueError(msg)
+    return {key: part["input"] + part["solution"] for key, part in baseline["parts"].items()}
+
+
+def save_baseline(benchmarks: list[Benchmark], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf8") as f:
+        json.dump({
+            "input_mode": AOC.input_mode.value,
+            "parts": {
+                b.data.key: {"input": b.input.median, "solution": b.solution.median}
+                for b in benchmarks
+            },
+        }, f, indent=2)
+        f.write("\n")
+
+
+def report(comparisons: list[Comparison]) -> None:
+    def status(c: Comparison) -> tuple[str, int]:
+        if c.baseline is None:
+            return chalk.hex("0af")("new"), 3
+        if c.is_regression:
+            return chalk.hex("f30")("SLOWER"), 6
+        return chalk.hex("0c6")("ok"), 2
+
+    log_table([
+        ["Year", "Day", "Part", "Baseline", "Median", "Ratio", "Status"],
+        *([
+            *c.data,
+            human_readable_duration(c.baseline) if c.baseline else "",
+            human_readable_duration(c.median),
+            f"{c.ratio:.2f}" if c.ratio else "",
+            status(c),
+        ] for c in comparisons),
+    ])
+
+
+def check_perf(benchmarks: list[Benchmark], baseline: dict[str, int], max_ratio: float, min_duration: int) -> bool:
+    """
+    Compare the median timings of the benchmarked parts with the baseline.
+    Returns False when any part got slower than max_ratio times its baseline.
+    """
+    comparisons = [
+        Comparison(b.data, baseline.get(b.data.key), _median(b), max_ratio, min_duration)
+        for b in benchmarks
+    ]
+    report(comparisons)
+    regressions = [c for c in comparisons if c.is_regression]
+    logging.info(" ")
+    if regressions:
+        logging.error("%d part(s) got more than %.2f times slower than the baseline", len(regressions), max_ratio)
+    else:
+        logging.info(" No performance regressions compared to the baseline")
+    return not regressions
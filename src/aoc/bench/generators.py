@@ -0,0 +1,94 @@
+"""
+Generators of synthetic inputs, to see how solutions scale with inputs (much) larger than the puzzle inputs.
+At scale 1, a generated input is about as big as the actual puzzle input, at scale n it is about n times as big
+(in lines, grid cells or characters, whatever the input of the day consists of).
+"""
+import random
+from collections.abc import Callable
+from math import sqrt
+
+from aoc.problems import FatalError
+
+# Generates an input of a certain scale
+Generator = Callable[[random.Random, float], str]
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+
+
+def generator(year: int, day: int) -> Callable[[Generator], Generator]:
+    def register(func: Generator) -> Generator:
+        GENERATORS[year, day] = func
+        return func
+
+    return register
+
+
+def generate(year: int, day: int, scale: float, seed: int = 0) -> str:
+    """Generate an input for a day. The same seed and scale give the same input."""
+    if (year, day) not in GENERATORS:
+        msg = f"There is no input generator for {year} day {day}, these days have one: " + ", ".join(
+            f"{y}/{d:02d}" for y, d in sorted(GENERATORS)
+        )
+        raise FatalError(msg)
+    return GENERATORS[year, day](random.Random(seed), scale)  # noqa: S311
+
+
+def _scaled_size(width: int, height: int, scale: float) -> tuple[int, int]:
+    # Both sides grow with the square root, so the number of cells grows linearly with the scale.
+    factor = sqrt(scale)
+    return max(2, round(width * factor)), max(2, round(height * factor))
+
+
+def _digit_grid(rng: random.Random, width: int, height: int) -> str:
+    return "".join("".join(rng.choices("123456789", k=width)) + "\n" for _ in range(height))
+
+
+@generator(2021, 15)
+def chiton_cave(rng: random.Random, scale: float) -> str:
+    return _digit_grid(rng, *_scaled_size(100, 100, scale))
+
+
+@generator(2022, 12)
+def hill(rng: random.Random, scale: float) -> str:
+    """
+    Hills get higher from west to east, the middle row is a climbable path from S (west) to E (east).
+    Elsewhere there are pits to fall into, which can be too deep to climb out of.
+    """
+    width, height = _scaled_size(173, 41, scale)
+    width = max(width, 27)
+    middle = height // 2
+    rows = []
+    for y in range(height):
+        row = []
+        for x in range(width):
+            elevation = x * 25 // (width - 1)
+            if y != middle and rng.random() < 0.3:
+                elevation = max(0, elevation - rng.randint(1, 5))
+            row.append(chr(ord("a") + elevation))
+        rows.append(row)
+    rows[middle][0], rows[middle][-1] = "S", "E"
+    return "".join("".join(row) + "\n" for row in rows)
+
+
+@generator(2022, 17)
+def jets(rng: random.Random, scale: float) -> str:
+    return "".join(rng.choices("<>", k=max(1, round(10_091 * scale)))) + "\n"
+
+
+@generator(2023, 17)
+def city_blocks(rng: random.Random, scale: float) -> str:
+    return _digit_grid(rng, *_scaled_size(141, 141, scale))
+
+
+@generator(2023, 24)
+def hailstones(rng: random.Random, scale: float) -> str:
+    """Hailstones that will all be hit by one rock thrown from a secret position with a secret velocity."""
+    rock_position = [rng.randint(100_000_000_000_000, 300_000_000_000_000) for _ in range(3)]
+    rock_velocity = [rng.randint(-300, 300) for _ in range(3)]
+    lines = []
+    for t in rng.sample(range(100_000_000_000, 1_000_000_000_000), max(3, round(300 * scale))):
+        # The rock can't hit a hailstone that has the same speed in some direction.
+        velocity = [rng.choice([v for v in range(-300, 301) if v != rv]) for rv in rock_velocity]
+        position = [p + t * (rv - v) for p, rv, v in zip(rock_position, rock_velocity, velocity, strict=True)]
+        lines.append(f"{', '.join(map(str, position))} @ {', '.join(map(str, velocity))}\n")
+    return "".join(lines)
@@ -0,0 +1,85 @@
+"""
+Compare the parse library with the compiled parsers of aoc.parsing on large generated inputs:
+
+    python -m aoc.bench.parsing [LINES]
+"""
+import logging
+import random
+import sys
+from collections.abc import Callable
+from functools import partial
+from importlib import import_module
+from time import perf_counter_ns
+
+import parse  # type: ignore[import-untyped]
+
+from aoc import AOC, InputMode
+from aoc.bench import Stats
+from aoc.parsing import Parser, extra_types
+from aoc.utils import human_readable_duration, log_table
+
+
+def _cuboid(rng: random.Random) -> str:
+    x, y, z = (rng.randint(-100_000, 100_000) for _ in range(3))
+    size = rng.randint(1, 50_000)
+    return f"{rng.choice(['on', 'off'])} x={x}..{x + size},y={y}..{y + size},z={z}..{z + size}"
+
+
+def _sensor(rng: random.Random) -> str:
+    sx, sy, bx, by = (rng.randint(-4_000_000, 4_000_000) for _ in range(4))
+    return f"Sensor at x={sx}, y={sy}: closest beacon is at x={bx}, y={by}"
+
+
+def _brick(rng: random.Random) -> str:
+    x, y, z = rng.randint(0, 9), rng.randint(0, 9), rng.randint(1, 300)
+    return f"{x},{y},{z}~{x + rng.randint(0, 3)},{y},{z + rng.randint(0, 3)}"
+
+
+# Days with many parsed lines, and how to generate a line of their input
+DAYS: dict[str, Callable[[random.Random], str]] = {
+    "aoc.year2021.day22": _cuboid,
+    "aoc.year2022.day15": _sensor,
+    "aoc.year2023.day22": _brick,
+}
+
+
+def _time(func: Callable[[], object], repetitions: int) -> Stats:
+    samples = []
+    for _ in range(repetitions):
+        start = perf_counter_ns()
+        func()
+        samples.append(perf_counter_ns() - start)
+    return Stats.of(samples)
+
+
+def _parse_findall(module_name: str, pattern: str, text: str) -> list[tuple]:
+    # The old way: collect the extra types and let parse compile the pattern every time.
+    return [r.fixed for r in parse.findall(pattern, text, extra_types=extra_types(module_name))]
+
+
+def bench_parsing(lines: int = 10_000, repetitions: int = 5) -> None:
+    rng = random.Random(2021)  # noqa: S311
+    rows: list[list[object]] = [["Day", "Lines", "parse", "Compiled", "Speedup"]]
+    for module_name, line in DAYS.items():
+        problem_cls = import_module(module_name).Problem1
+        pattern = problem_cls.line_pattern + "\n"
+        text = "".join(line(rng) + "\n" for _ in range(lines))
+        types = extra_types(module_name)
+        compiled = Parser(pattern, types)
+        if compiled.findall(text) != [r.fixed for r in parse.findall(pattern, text, extra_types=types)]:
+            logging.error("Different results for %s", module_name)
+        old = _time(partial(_parse_findall, module_name, pattern, text), repetitions)
+        new = _time(partial(compiled.findall, text), repetitions)
+        rows.append([
+            module_name.removeprefix("aoc."),
+            lines,
+            human_readable_duration(old.median),
+            human_readable_duration(new.median),
+            f"{old.median / new.median:.1f}x",
+        ])
+    log_table(rows)
+
+
+if __name__ == "__main__":
+    AOC.setup(InputMode.NONE, debugging=False)
+    bench_parsing(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,115 @@
+"""
+Solve a part for generated inputs of increasing size, and fit how time and memory grow with the input size n
+(assuming they're proportional to n^k, which is a straight line with slope k on a log-log scale).
+"""
+import logging
+import statistics
+from math import log
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import NamedTuple
+
+from aoc import AOC
+from aoc.bench.generators import generate
+from aoc.problems import FatalError, Outcome, Problem
+from aoc.utils import human_readable_duration, human_readable_size, log_table
+
+
+class Measurement(NamedTuple):
+    scale: float
+    # Size of the input in bytes
+    n: int
+    outcome: Outcome
+    duration: int
+    traced: int
+    rss: int
+
+
+def fit_exponent(ns: list[int], values: list[int]) -> float | None:
+    """
+    Exponent k of the best fitting n^k (least squares on a log-log scale).
+
+    >>> round(fit_exponent([10, 100, 1000], [5, 500, 50_000]), 3)
+    2.0
+    """
+    points = [(log(n), log(v)) for n, v in zip(ns, values, strict=True) if n > 0 and v > 0]
+    if len(points) < 2:
+        return None
+    slope, _ = statistics.linear_regression(*zip(*points, strict=True))
+    return slope
+
+
+def _measure(problem_cls: type[Problem], data: Problem.Data, scale: float, path: Path) -> Measurement:
+    path.write_text(text := generate(data.year, data.day, scale))
+    AOC.input_path = path
+    try:
+        # Tracing allocations slows things down too much to time the same run.
+        AOC.measure_memory = False
+        result = problem_cls.run(*data)
+        AOC.measure_memory = True
+        memory = problem_cls.run(*data).memory
+    finally:
+        AOC.input_path, AOC.measure_memory = None, False
+    traced, rss = (max(phase) for phase in zip(*memory, strict=True)) if memory else (0, 0)
+    return Measurement(scale, len(text.encode()), result.outcome, result.duration, traced, rss)
+
+
+def plot(measurements: list[Measurement], path: Path, title: str) -> None:
+    import matplotlib as mpl
+
+    mpl.use("Agg")
+    from matplotlib import pyplot as plt
+
+    ns = [m.n for m in measurements]
+    fig, (time_axes, memory_axes) = plt.subplots(1, 2, figsize=(12, 5))
+    fig.suptitle(title)
+    for axes, label, values, unit in (
+        (time_axes, "time", [m.duration / 1_000_000 for m in measurements], "ms"),
+        (memory_axes, "traced memory", [m.traced / 1024 / 1024 for m in measurements], "MiB"),
+        (memory_axes, "RSS", [m.rss / 1024 / 1024 for m in measurements], "MiB"),
+    ):
+        k = fit_exponent(ns, values)  # type: ignore[arg-type]
+        axes.loglog(ns, values, "o-", label=f"{label} ~ n^{k:.2f}" if k is not None else label)
+        axes.set_xlabel("input size n (bytes)")
+        axes.set_ylabel(unit)
+        axes.grid(visible=True, which="both", alpha=0.3)
+        axes.legend()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def scale(problem_cls: type[Problem], data: Problem.Data, scales: list[float], output_dir: Path) -> list[Measurement]:
+    """Solve the part for generated inputs of all scales, report how it scales and plot it."""
+    measurements: list[Measurement] = []
+    with TemporaryDirectory() as input_dir:
+        for s in scales:
+            try:
+                measurement = _measure(problem_cls, data, s, Path(input_dir) / f"{data.year}_{data.day:02d}_{s:g}.txt")
+            except FatalError as exc:
+                logging.fatal(exc.message)
+                return measurements
+            if measurement.outcome not in (Outcome.CORRECT, Outcome.WRONG, Outcome.ATTEMPTED):
+                logging.warning("Stopped scaling at scale %g: %s", s, measurement.outcome.value)
+                break
+            measurements.append(measurement)
+    log_table([
+        ["Scale", "Input size", "Time", "Traced memory", "RSS"],
+        *([
+            f"{m.scale:g}", human_readable_size(m.n), human_readable_duration(m.duration),
+            human_readable_size(m.traced), human_readable_size(m.rss),
+        ] for m in measurements),
+    ])
+    ns = [m.n for m in measurements]
+    logging.info(" ")
+    for label, values in (
+        ("time", [m.duration for m in measurements]),
+        ("traced memory", [m.traced for m in measurements]),
+        ("RSS", [m.rss for m in measurements]),
+    ):
+        if (k := fit_exponent(ns, values)) is not None:
+            logging.info(" %s grows like n^%.2f", label, k)
+    if len(measurements) > 1:
+        plot(measurements, path := output_dir / f"{data.year}_{data.day:02d}_{data.part}.png", data.key)
+        logging.info(" Wrote %s", path)
+    return measurements
@@ -0,0 +1,181 @@
+"""
+Compare the Dijkstra engines of aoc.search (a heap, and a bucket queue for days with small weights) with
+the queue.PriorityQueue based engine they replaced, on the Dijkstra heavy days
+(generated inputs where there is a generator, the test input otherwise),
+and the number of states one-sided and bidirectional searches visit on the point-to-point days:
+
+    python -m aoc.bench.search [SCALE]
+"""
+import logging
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import partial
+from importlib import import_module
+from pathlib import Path
+from queue import PriorityQueue
+from tempfile import TemporaryDirectory
+from time import perf_counter_ns
+from typing import Any, NamedTuple
+
+from aoc import AOC, InputMode
+from aoc.bench import Stats
+from aoc.bench.generators import GENERATORS, generate
+from aoc.problems import Problem
+from aoc.search import D, DialState, DijkstraState, ShortestPathDial, ShortestPathDijkstra, State
+from aoc.utils import human_readable_duration, log_table, timed
+
+# Days (and parts) that spend most of their time in Dijkstra
+DAYS = [(2021, 15, 2), (2023, 17, 1), (2023, 17, 2), (2022, 24, 2), (2021, 23, 1)]
+
+
+class Search(NamedTuple):
+    """A point-to-point search of a day: from the sources to the goal."""
+
+    state_cls: type[State]
+    sources: list[Any]
+    goal: Any
+    constants: Any
+
+
+def _chiton_cave(problem: Problem) -> list[Search]:
+    from aoc.year2021.day15 import ChitonState, Constants, Variables
+
+    c = Constants(problem.grid)  # type: ignore[attr-defined]
+    return [Search(ChitonState, [Variables()], Variables(c.end_position), c)]
+
+
+def _hill(problem: Problem, start: str) -> list[Search]:
+    from aoc.year2022.day12 import END, Constants, Variables, _BFSState, _DijkstraState
+
+    grid = problem.grid  # type: ignore[attr-defined]
+    sources = [Variables(p) for p in grid.points_with_value(problem.convert_element(start))]  # type: ignore[attr-defined]
+    goal, c = Variables(grid.point_with_value(END)), Constants(grid, END)
+    return [Search(state_cls, sources, goal, c) for state_cls in (_BFSState, _DijkstraState)]
+
+
+# Point-to-point days (and parts) with the searches they do
+BIDIRECTIONAL_DAYS: dict[tuple[int, int, int], Callable[[Problem], list[Search]]] = {
+    (2021, 15, 1): _chiton_cave,
+    (2022, 12, 1): partial(_hill, start="S"),
+    (2022, 12, 2): partial(_hill, start="a"),
+}
+
+
+class PriorityQueueDijkstra(ShortestPathDijkstra[D]):
+    """The old engine: a (thread safe) PriorityQueue of states, ordered by State.__lt__."""
+
+    def __init__(self, initial_state: D, *more_initial_states: D) -> None:
+        super().__init__(initial_state, *more_initial_states)
+        self._priority_queue: PriorityQueue[D] = PriorityQueue()
+
+    def from_queue(self) -> Iterator[D]:
+        while not self._priority_queue.empty():
+            yield self._priority_queue.get_nowait()
+
+    def to_queue(self, state: D) -> None:
+        self._priority_queue.put_nowait(state)
+
+    @property
+    def frontier_size(self) -> int:
+        return self._priority_queue.qsize()
+
+
+@contextmanager
+def _engine(engine: type[ShortestPathDijkstra]) -> Iterator[None]:
+    originals = DijkstraState.path_finder_cls, DialState.path_finder_cls
+    DijkstraState.path_finder_cls = engine
+    DialState.path_finder_cls = engine  # type: ignore[assignment]
+    try:
+        yield
+    finally:
+        DijkstraState.path_finder_cls, DialState.path_finder_cls = originals
+
+
+def _time_solution(problem_cls: type[Problem], repetitions: int) -> tuple[Stats, object]:
+    samples, solution = [], None
+    for _ in range(repetitions):
+        problem = problem_cls()
+        start = perf_counter_ns()
+        solution = problem.solution()
+        samples.append(perf_counter_ns() - start)
+    return Stats.of(samples), solution
+
+
+def _uses_dial(module_name: str) -> bool:
+    return any(
+        isinstance(obj, type) and issubclass(obj, DialState) and obj is not DialState
+        for obj in vars(sys.modules[module_name]).values()
+    )
+
+
+def bench_search(scale: float = 1.0, repetitions: int = 3) -> None:
+    engines: dict[str, type[ShortestPathDijkstra]] = {
+        "PriorityQueue": PriorityQueueDijkstra,
+        "heapq": ShortestPathDijkstra,
+        "Dial": ShortestPathDial,
+    }
+    rows: list[list[object]] = [["Day", "Input", *engines, "Speedup"]]
+    with TemporaryDirectory() as input_dir:
+        for year, day, part in DAYS:
+            module = import_module(f"aoc.year{year}.day{day:02d}")
+            problem_cls = getattr(module, f"Problem{part}")
+            problem_cls.data = data = Problem.Data(year, day, part)
+            if (year, day) in GENERATORS:
+                AOC.input_mode, AOC.input_path = InputMode.PUZZLE, Path(input_dir) / f"{year}_{day:02d}.txt"
+                AOC.input_path.write_text(generate(year, day, scale))
+                input_name = f"scale {scale:g}"
+            else:
+                AOC.input_mode, AOC.input_path = InputMode.TEST, None
+                input_name = "test"
+            medians: dict[str, int] = {}
+            solutions = set()
+            for name, engine in engines.items():
+                if engine is ShortestPathDial and not _uses_dial(module.__name__):
+                    # Only days with small weights can use buckets.
+                    continue
+                with _engine(engine):
+                    stats, solution = _time_solution(problem_cls, repetitions)
+                medians[name] = stats.median
+                solutions.add(solution)
+            if len(solutions) > 1:
+                logging.error("Different solutions for %s: %s", data.key, solutions)
+            rows.append([
+                data.key, input_name,
+                *(human_readable_duration(medians[name]) if name in medians else "-" for name in engines),
+                f"{medians['PriorityQueue'] / min(medians.values()):.1f}x",
+            ])
+    AOC.input_path = None
+    log_table(rows)
+
+
+def bench_bidirectional(scale: float = 1.0) -> None:
+    """Visited states (and time) of the one-sided engines and their bidirectional counterparts."""
+    rows: list[list[object]] = [["Day", "Engine", "Visited", "Bidirectional", "Ratio", "Time", "Bidirectional"]]
+    with TemporaryDirectory() as input_dir:
+        for (year, day, part), searches in BIDIRECTIONAL_DAYS.items():
+            problem_cls = getattr(import_module(f"aoc.year{year}.day{day:02d}"), f"Problem{part}")
+            problem_cls.data = data = Problem.Data(year, day, part)
+            AOC.input_mode, AOC.input_path = InputMode.PUZZLE, Path(input_dir) / f"{year}_{day:02d}.txt"
+            AOC.input_path.write_text(generate(year, day, scale))
+            for search in searches(problem_cls()):
+                state_cls, sources, goal, c = search
+                one_sided, _, t_one_sided = timed(partial(state_cls.find_path, None, c, sources=sources))
+                bidirectional, _, t_bidirectional = timed(partial(state_cls.find_path_between, sources, goal, c))
+                if one_sided.length != bidirectional.length:
+                    logging.error("Different lengths for %s: %d, %d", data.key, one_sided.length, bidirectional.length)
+                rows.append([
+                    data.key, state_cls.path_finder_cls.__name__.removeprefix("ShortestPath"),
+                    len(one_sided.visited), len(bidirectional.visited),
+                    f"{len(bidirectional.visited) / len(one_sided.visited):.2f}", t_one_sided, t_bidirectional,
+                ])
+    AOC.input_path = None
+    log_table(rows)
+
+
+if __name__ == "__main__":
+    AOC.setup(InputMode.PUZZLE, debugging=False)
+    bench_scale = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    bench_search(bench_scale)
+    logging.info(" ")
+    bench_bidirectional(bench_scale)
@@ -0,0 +1,166 @@
+import ast
+import json
+import logging
+import os
+import pickle
+import sqlite3
+from functools import cache
+from hashlib import sha256
+from importlib.util import find_spec
+from pathlib import Path
+
+# Everything that can influence what process_input() makes of the input.
+PARSER_ATTRIBUTES = ("process_input", "convert_element", "line_pattern", "multi_line_pattern")
+
+
+def parser_key(cls: type) -> str:
+    """Identify the parser of a problem class by the classes that define its parsing behaviour."""
+    owners = []
+    for name in PARSER_ATTRIBUTES:
+        owner = next((c for c in cls.__mro__ if name in vars(c)), None)
+        if owner is not None:
+            owners.append(f"{name}={owner.__module__}.{owner.__qualname__}")
+    return ",".join(owners)
+
+
+class ParseCache:
+    """
+    Keeps the attributes that set_input() added to a problem instance, so e.g. part 2 of a day
+    can reuse the parsed input of part 1. Entries are stored pickled, which makes every read
+    a fresh copy: solutions are free to mutate whatever they get.
+    """
+
+    def __init__(self, directory: Path | None = None):
+        self.directory = directory
+        self._entries: dict[str, bytes] = {}
+        if directory:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(problem_cls: type, input_: str) -> str:
+        return sha256("\n".join([
+            problem_cls.__module__,
+            parser_key(problem_cls),
+            sha256(input_.encode()).hexdigest(),
+        ]).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path | None:
+        return self.directory / f"{key}.pickle" if self.directory else None
+
+    def get(self, key: str) -> dict[str, object] | None:
+        data = self._entries.get(key)
+        if data is None and (path := self._path(key)) and path.exists():
+            data = self._entries[key] = path.read_bytes()
+        return None if data is None else pickle.loads(data)  # noqa: S301 (we wrote it ourselves)
+
+    def put(self, key: str, attributes: dict[str, object]) -> None:
+        try:
+            data = pickle.dumps(attributes, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError) as exc:
+            # e.g. lambdas in the parsed input: just parse again next time
+            logging.debug("Not caching parsed input: %s", exc)
+            return
+        self._entries[key] = data
+        if path := self._path(key):
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+
+
+@cache
+def _module_file(name: str) -> Path | None:
+    try:
+        spec = find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    return Path(spec.origin) if spec and spec.origin and spec.origin.endswith(".py") else None
+
+
+def _imported_modules(tree: ast.Module) -> set[str]:
+    """Names of all aoc modules that could be imported by a module (lazy imports included)."""
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            # from aoc import geo3d
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+        elif (
+            isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "lazy_import"
+            and node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)
+        ):
+            names.add(node.args[0].value)
+    return {name for name in names if name.split(".")[0] == "aoc" and _module_file(name)}
+
+
+@cache
+def _module_info(name: str) -> tuple[str, frozenset[str]]:
+    """Hash of the source of a module, and the aoc modules it imports."""
+    source = (_module_file(name) or Path()).read_bytes()
+    return sha256(source).hexdigest(), frozenset(_imported_modules(ast.parse(source)))
+
+
+def source_key(module: str) -> str:
+    """Hash the sources of a module and of all aoc modules it (indirectly) imports."""
+    todo, hashes = [module], {}
+    while todo:
+        if (name := todo.pop()) in hashes:
+            continue
+        hashes[name], imports = _module_info(name)
+        todo.extend(imports)
+    return sha256(json.dumps(sorted(hashes.items())).encode()).hexdigest()
+
+
+class AnswerCache:
+    """
+    Keeps the answers (and timings) of solved parts in a SQLite database, so unchanged days don't have to be
+    solved again. An answer is identified by the sources of the day module and of the aoc modules it imports,
+    the input, the part and the input mode. With read=False, everything is solved again and stored afresh.
+    """
+
+    def __init__(self, path: Path, read: bool = True):
+        self.path = path
+        self.read = read
+        self._db: sqlite3.Connection | None = None
+
+    def __getstate__(self) -> dict[str, object]:
+        # Every process opens the database by itself.
+        return {**vars(self), "_db": None}
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._db.execute("CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, answer BLOB, durations TEXT)")
+        return self._db
+
+    @staticmethod
+    def key(problem_cls: type, input_mode: str, input_: str) -> str:
+        return sha256("\n".join([
+            source_key(problem_cls.__module__),
+            problem_cls.__qualname__,
+            input_mode,
+            sha256(input_.encode()).hexdigest(),
+        ]).encode()).hexdigest()
+
+    def get(self, key: str) -> tuple[object, list[int]] | None:
+        if not self.read:
+            return None
+        row = self.db.execute("SELECT answer, durations FROM answers WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        answer, durations = row
+        return pickle.loads(answer), json.loads(durations)  # noqa: S301 (we wrote it ourselves)
+
+    def put(self, key: str, answer: object, durations: list[int]) -> None:
+        try:
+            data = pickle.dumps(answer, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, AttributeError, TypeError) as exc:
+            logging.debug("Not caching answer: %s", exc)
+            return
+        self.db.execute(
+            "INSERT OR REPLACE INTO answers (key, answer, durations) VALUES (?, ?, ?)",
+            (key, data, json.dumps(durations)),
+        )
@@ -1,28 +1,225 @@
 import argparse
+import logging
+import sys
 from datetime import UTC, datetime
 from importlib import import_module
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-from aoc import InputMode
+from aoc import AOC, InputMode
 
 if TYPE_CHECKING:
+    from aoc.cache import AnswerCache
     from aoc.problems import Problem
 
+ANSWER_CACHE = Path(".aoc_cache") / "answers.sqlite"
 
-def main() -> None:
-    ty, tm, td = (t := datetime.now(UTC).date()).year, t.month, t.day
-    y, d = (ty + int(dec := tm == 12) - 1), (td if dec and td <= 25 else None)
+
+def _parts(args: argparse.Namespace, year: int) -> list["Problem.Data"]:
+    from aoc.batch import discover
+    from aoc.problems import Problem
+
+    if not args.all:
+        return [Problem.Data(year, args.day, args.part)]
+    return discover([args.year] if args.year else None, [args.part] if args.part else [1, 2])
+
+
+def _answer_cache(args: argparse.Namespace) -> "AnswerCache | None":
+    from aoc.cache import AnswerCache
+
+    return AnswerCache(ANSWER_CACHE, read=not args.no_cache) if args.cache or args.no_cache else None
+
+
+def _modules(args: argparse.Namespace, year: int) -> list[str]:
+    """The day modules selected by the arguments."""
+    from aoc.batch import discover
+
+    if args.all:
+        days = sorted({(data.year, data.day) for data in discover([year] if args.year else None)})
+    else:
+        days = [(year, args.day)] if args.day else []
+    return [f"aoc.year{y}.day{d:02d}" for y, d in days]
+
+
+def _startup_report(args: argparse.Namespace, year: int) -> bool:
+    from aoc.startup import report
+
+    return report(["aoc.cli", "aoc.problems", *_modules(args, year)], budget_ms=args.startup_budget)
+
+
+def _check_perf(args: argparse.Namespace, year: int, parser: argparse.ArgumentParser, input_mode: InputMode) -> bool:
+    from aoc.bench import benchmark_all
+    from aoc.bench.baseline import baseline_input_mode, check_perf, load_baseline, save_baseline
+
+    try:
+        if not (args.test or args.no_input) and args.baseline.exists():
+            # Puzzle inputs aren't committed, so compare with whatever input the baseline was made with.
+            input_mode = baseline_input_mode(args.baseline)
+        AOC.setup(input_mode, args.debug)
+        baseline = {} if args.update_baseline and not args.baseline.exists() else load_baseline(args.baseline)
+    except (OSError, ValueError, KeyError) as exc:
+        parser.error(f"could not read baseline: {exc}")
+    benchmarks = benchmark_all(_parts(args, year), args.bench or 5, args.warmup)
+    ok = check_perf(benchmarks, baseline, args.max_ratio, int(args.min_duration * 1_000_000))
+    if args.update_baseline:
+        save_baseline(benchmarks, args.baseline)
+        logging.info(" Updated baseline %s with %d parts", args.baseline, len(benchmarks))
+        return True
+    return ok
+
+
+def _scales(factors: str) -> list[float]:
+    return [float(f) for f in factors.split(",")]
+
+
+def _argument_parser(y: int, d: int | None) -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--year", dest="year", type=int, default=y, choices=[2019, *range(2021, y + 1)])
-    parser.add_argument("--day", dest="day", type=int, default=d, choices=list(range(1, 26)), required=not d)
-    parser.add_argument("--part", dest="part", type=int, choices=[1, 2], required=True)
+    parser.add_argument("--year", dest="year", type=int, choices=[2019, *range(2021, y + 1)])
+    parser.add_argument("--day", dest="day", type=int, default=d, choices=list(range(1, 26)))
+    parser.add_argument("--part", dest="part", type=int, choices=[1, 2])
     parser.add_argument("-t", "--test", dest="test", action="store_true")
     parser.add_argument("-d", "--debug", dest="debug", action="store_true")
     parser.add_argument("-n", "--no-input", dest="no_input", action="store_true")
-    args = parser.parse_args()
+    parser.add_argument("-a", "--all", dest="all", action="store_true",
+                        help="solve all days (of the given year, or of all years) in parallel")
+    parser.add_argument("-j", "--jobs", dest="jobs", type=int,
+                        help="number of worker processes for --all (default: number of cores)")
+    parser.add_argument("--parse-cache", dest="parse_cache", nargs="?", type=Path, const=Path(".aoc_cache") / "parsed",
+                        metavar="DIR", help="persist parsed inputs of --all runs on disk (default: .aoc_cache/parsed)")
+    parser.add_argument("--timeout", dest="timeout", type=float, metavar="SECONDS",
+                        help="kill parts of --all runs that take longer than this")
+    parser.add_argument("--max-memory", dest="max_memory", type=int, metavar="MB",
+                        help="limit the address space of every part of --all runs to this many megabytes")
+    parser.add_argument("--cache", dest="cache", action="store_true",
+                        help="reuse the answers of parts of which neither the code nor the input changed "
+                             "(stored in .aoc_cache/answers.sqlite)")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true",
+                        help="solve everything again, and refresh the cached answers")
+    parser.add_argument("--bench", dest="bench", type=int, metavar="N",
+                        help="benchmark by solving N times (after warmup runs) and report timing statistics")
+    parser.add_argument("--warmup", dest="warmup", type=int, default=1, metavar="N",
+                        help="number of warmup runs before benchmarking (default: 1)")
+    parser.add_argument("--json", dest="json", type=Path, default=Path("bench_output.json"), metavar="FILE",
+                        help="file to write benchmark results to (default: bench_output.json)")
+    parser.add_argument("--check-perf", dest="check_perf", action="store_true",
+                        help="benchmark all days and fail when any part got slower than its baseline timing "
+                             "(with the input the baseline was made with, unless -t or -n is given)")
+    parser.add_argument("--baseline", dest="baseline", type=Path, default=Path("benchmarks") / "baseline.json",
+                        metavar="FILE", help="timing baseline for --check-perf (default: benchmarks/baseline.json)")
+    parser.add_argument("--max-ratio", dest="max_ratio", type=float, default=1.5,
+                        help="how many times slower than the baseline a part may get (default: 1.5)")
+    parser.add_argument("--min-duration", dest="min_duration", type=float, default=1.0, metavar="MS",
+                        help="baseline timings below this many milliseconds are considered too noisy (default: 1)")
+    parser.add_argument("--update-baseline", dest="update_baseline", action="store_true",
+                        help="write the timings measured by --check-perf to the baseline file")
+    parser.add_argument("--startup-report", dest="startup_report", action="store_true",
+                        help="report interpreter startup and import times for solving the selected day(s)")
+    parser.add_argument("--startup-budget", dest="startup_budget", type=float, metavar="MS",
+                        help="fail the startup report when startup takes longer than this many milliseconds")
+    parser.add_argument("--mem", dest="mem", action="store_true",
+                        help="report peak traced allocations and peak RSS of initialization and solution "
+                             "(tracing slows solving down)")
+    parser.add_argument("--search-stats", dest="search_stats", nargs="?", type=Path,
+                        const=Path("search_stats.json"), metavar="FILE",
+                        help="count what the searches do (states popped, generated, skipped, frontier size, costs), "
+                             "show it when debugging and write it to FILE as JSON (default: search_stats.json)")
+    parser.add_argument("--input", dest="input", type=Path, metavar="FILE",
+                        help="solve for the input in FILE instead of the puzzle or test input")
+    parser.add_argument("--stream", dest="stream", action="store_true",
+                        help="memory map the input file and process it line by line, for very large inputs "
+                             "(for days that support it)")
+    parser.add_argument("--scale", dest="scale", type=_scales, metavar="FACTORS",
+                        help="solve for generated inputs of these comma separated sizes (relative to the puzzle "
+                             "input, e.g. 1,2,4,8), fit how time and memory grow and plot it to the scaling dir")
+    parser.add_argument("--profile", dest="profile", nargs="?", type=Path, const=Path("profiles"), metavar="DIR",
+                        help="profile solving and write pstats, collapsed stacks and speedscope files to DIR "
+                             "(default: profiles)")
+    parser.add_argument("--top", dest="top", type=int, default=20, metavar="N",
+                        help="number of hot functions to show with --profile (default: 20)")
+    parser.add_argument("--serve", dest="serve", action="store_true",
+                        help="keep modules imported and solve requests of other solve commands (with --all: "
+                             "preload all days as well). Once any loaded module is edited, or for another checkout, "
+                             "requests are solved locally again until the server is restarted")
+    parser.add_argument("--local", dest="local", action="store_true",
+                        help="solve in this process, even when a solve server is running")
+    return parser
+
+
+def _solve(problem_cls: type["Problem"], args: argparse.Namespace, year: int, input_mode: InputMode) -> None:
+    AOC.measure_memory = args.mem
+    AOC.answer_cache = _answer_cache(args)
+    AOC.search_stats = [] if args.search_stats else None
+    problem_cls.solve(year, args.day, args.part, input_mode, args.debug)
+    if AOC.search_stats is not None:
+        from aoc.search import write_stats
+
+        write_stats(AOC.search_stats, args.search_stats)
+        logging.info(" Wrote statistics of %d searches to %s", len(AOC.search_stats), args.search_stats)
+
+
+def _request_server(argv: list[str]) -> int | None:
+    if {"--serve", "--local"} & set(argv):
+        return None
+    from aoc.server import request, socket_path
+
+    return request(argv, socket_path())
+
+
+def main(argv: list[str] | None = None) -> None:
+    # Called from the command line: let a running server do the work if there is one.
+    if argv is None and (code := _request_server(sys.argv[1:])) is not None:
+        sys.exit(code)
+    ty, tm, td = (t := datetime.now(UTC).date()).year, t.month, t.day
+    y, d = (ty + int(dec := tm == 12) - 1), (td if dec and td <= 25 else None)
+    parser = _argument_parser(y, d)
+    args = parser.parse_args(argv)
+    args.all = args.all or args.check_perf
     input_mode = InputMode.NONE if args.no_input else InputMode.TEST if args.test else InputMode.PUZZLE
-    problem_cls: type[Problem] = getattr(import_module(f"aoc.year{args.year}.day{args.day:02d}"), f"Problem{args.part}")
-    problem_cls.solve(args.year, args.day, args.part, input_mode, args.debug)
+    year = args.year or y
+    AOC.input_path, AOC.streaming_input = args.input, args.stream
+    if args.serve:
+        from aoc.server import serve, socket_path
+
+        AOC.setup(input_mode, args.debug)
+        sys.exit(0 if serve(socket_path(), _modules(args, year) if args.all else []) else 1)
+    if args.startup_report:
+        AOC.setup(input_mode, args.debug)
+        sys.exit(0 if _startup_report(args, year) else 1)
+    if not args.all and (args.day is None or args.part is None):
+        parser.error("the following arguments are required: " + ", ".join(
+            f"--{name}" for name in ("day", "part") if getattr(args, name) is None
+        ))
+    if args.check_perf:
+        sys.exit(0 if _check_perf(args, year, parser, input_mode) else 1)
+    if args.bench:
+        from aoc.bench import bench
+
+        AOC.setup(input_mode, args.debug)
+        bench(_parts(args, year), args.bench, args.warmup, args.json)
+        return
+    if args.all:
+        from aoc.batch import BatchOptions, solve_all
+
+        AOC.setup(input_mode, args.debug)
+        options = BatchOptions(
+            args.jobs, args.parse_cache, args.mem, args.timeout, args.max_memory and args.max_memory * 1024 * 1024,
+            _answer_cache(args),
+        )
+        sys.exit(0 if solve_all(_parts(args, year), input_mode, options) else 1)
+    problem_cls: type[Problem] = getattr(import_module(f"aoc.year{year}.day{args.day:02d}"), f"Problem{args.part}")
+    if args.scale:
+        from aoc.bench.scaling import scale
+
+        AOC.setup(input_mode, args.debug)
+        scale(problem_cls, problem_cls.Data(year, args.day, args.part), args.scale, Path("scaling"))
+        return
+    if args.profile:
+        from aoc.profiling import profile
+
+        AOC.setup(input_mode, args.debug)
+        profile(problem_cls, problem_cls.Data(year, args.day, args.part), args.profile, args.top)
+        return
+    _solve(problem_cls, args, year, input_mode)
 
 
 if __name__ == "__main__":
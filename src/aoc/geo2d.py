@@ -4,7 +4,7 @@ from collections.abc import Callable, Iterable, Iterator, Mapping
 from dataclasses import dataclass
 from functools import cached_property
 from math import hypot
-from os import get_terminal_size
+from shutil import get_terminal_size
 from typing import ClassVar, Generic, Literal, TypeVar, overload
 
 from aoc.utils import pairwise_circular, pixel, triplewise_circular
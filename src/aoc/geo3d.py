@@ -14,8 +14,9 @@ class P3D(NamedTuple):
 
     @classmethod
     def from_str(cls: type[P3D], s: str) -> P3D:
+        # int() ignores surrounding whitespace by itself
         x, y, z = s.split(",")
-        return cls(int(x.strip()), int(y.strip()), int(z.strip()))
+        return cls(int(x), int(y), int(z))
 
     @classmethod
     def unity(cls: type[P3D]) -> P3D:
@@ -0,0 +1,32 @@
+from importlib import import_module
+from types import ModuleType
+from typing import Any
+
+
+class LazyModule(ModuleType):
+    """Stand-in for a module that will only be imported as soon as one of its attributes is needed."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module: ModuleType | None = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = import_module(self.__name__)
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r} ({'not ' if self._module is None else ''}loaded)>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Defer importing (heavy) modules, like matplotlib, until they are actually used.
+    Combine with a regular import under TYPE_CHECKING to keep the type information:
+
+        if TYPE_CHECKING:
+            from matplotlib import pyplot as plt
+        else:
+            plt = lazy_import("matplotlib.pyplot")
+    """
+    return LazyModule(name)
@@ -0,0 +1,114 @@
+import resource
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+from types import TracebackType
+from typing import NamedTuple, Self
+
+from aoc.utils import human_readable_size
+
+STATM = Path("/proc/self/statm")
+PAGE_SIZE = resource.getpagesize()
+
+# How often the resident set size is sampled (in seconds).
+SAMPLE_INTERVAL = 0.001
+
+
+def max_rss() -> int:
+    """Highest resident set size of the process so far, in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def current_rss() -> int | None:
+    """Current resident set size in bytes, if the platform can tell (Linux only)."""
+    try:
+        return int(STATM.read_text().split()[1]) * PAGE_SIZE
+    except OSError:
+        return None
+
+
+class PhaseMemory(NamedTuple):
+    # Peak size of the memory blocks allocated by Python
+    traced: int
+    # Peak resident set size of the whole process (interpreter, modules & all)
+    rss: int
+
+    def __str__(self) -> str:
+        return f"{human_readable_size(self.traced)} traced, {human_readable_size(self.rss)} RSS"
+
+
+class MemoryUsage(NamedTuple):
+    init: PhaseMemory
+    solution: PhaseMemory
+
+    @property
+    def lines(self) -> list[str]:
+        labels = {"init": "init memory", "solution": "solution memory"}
+        width = max(len(label) for label in labels.values())
+        return [f"{labels[phase]:>{width}}: {memory}" for phase, memory in self._asdict().items()]
+
+
+class MemoryMonitor:
+    """
+    Keeps track of the peak memory usage of consecutive phases (initialization and solution).
+    Python allocations are traced with tracemalloc (which slows things down quite a bit),
+    the resident set size is sampled by a background thread. Since sampling can miss short peaks,
+    the peak RSS of the process is used whenever it was reached during a phase.
+    """
+
+    def __init__(self) -> None:
+        self.phases: list[PhaseMemory] = []
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._lock = threading.Lock()
+        self._peak_rss = 0
+        self._max_rss = 0
+
+    def _sample(self) -> None:
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            rss = current_rss()
+            if rss is None:
+                return
+            with self._lock:
+                self._peak_rss = max(self._peak_rss, rss)
+
+    def _start_phase(self) -> None:
+        tracemalloc.reset_peak()
+        with self._lock:
+            self._peak_rss = current_rss() or 0
+        self._max_rss = max_rss()
+
+    def next_phase(self) -> None:
+        """End the current phase, and start measuring the next one."""
+        _, traced = tracemalloc.get_traced_memory()
+        rss = current_rss() or 0
+        with self._lock:
+            rss = max(rss, self._peak_rss)
+        if (peak := max_rss()) > self._max_rss:
+            # A new all time high was reached during this phase.
+            rss = peak
+        self.phases.append(PhaseMemory(traced, rss))
+        self._start_phase()
+
+    def usage(self) -> MemoryUsage:
+        return MemoryUsage(*self.phases)
+
+    def __enter__(self) -> Self:
+        tracemalloc.start()
+        self._start_phase()
+        self._sampler.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.next_phase()
+        self._stop.set()
+        self._sampler.join()
+        tracemalloc.stop()
@@ -0,0 +1,137 @@
+import re
+import sys
+from collections.abc import Callable
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+from aoc.lazy import lazy_import
+from aoc.streaming import content_bounds
+
+if TYPE_CHECKING:
+    import parse  # type: ignore[import-untyped]
+
+    from aoc import geo3d
+else:
+    parse = lazy_import("parse")
+    geo3d = lazy_import("aoc.geo3d")
+
+Converter = Callable[[str], Any]
+
+# Splits a pattern into literal text, escaped braces and fields (the same way parse does).
+FIELDS = re.compile(r"(\{\{|\}\}|\{[^{}]*\})")
+
+# Regexes and converters of the standard field types that can be translated, like parse does it
+# (except for integers in other bases than 10).
+STANDARD_TYPES: dict[str, tuple[str, Converter | None]] = {
+    "": (r".+?", None),
+    "d": (r"[-+ ]?[0-9]+", int),
+    "w": (r"\w+", None),
+}
+
+
+def extra_types(module_name: str) -> dict[str, Converter]:
+    """Custom field types of a day: its __parse_* functions, and 3D points."""
+    prefix = "__parse_"
+    module = sys.modules[module_name]
+    return {
+        f[len(prefix):]: getattr(module, f)
+        for f in dir(module) if f.startswith(prefix)
+    } | {
+        "p3": geo3d.P3D.from_str,
+    }
+
+
+class Parser:
+    """
+    Finds all occurrences of a parse pattern in a text, like parse.findall(pattern, text).fixed does.
+    Patterns with only anonymous fields of the types {}, {:d}, {:w} and custom types are translated to one regex,
+    of which the matches are converted column by column. Anything fancier is left to the parse library.
+    """
+
+    def __init__(self, pattern: str, types: dict[str, Converter]):
+        self.pattern = pattern
+        self.types = types
+        self.converters: list[Converter | None] = []
+        regex = self._translate(pattern, types)
+        # Just like parse: case-insensitive, and . matches newlines as well.
+        self.regex = re.compile(regex, re.IGNORECASE | re.DOTALL) if regex is not None else None
+        self._compiled: Any = None
+        self._bytes_regex: re.Pattern[bytes] | None = None
+
+    def _translate(self, pattern: str, types: dict[str, Converter]) -> str | None:
+        regex = []
+        for part in FIELDS.split(pattern):
+            if part in ("{{", "}}"):
+                regex.append(re.escape(part[0]))
+            elif part.startswith("{") and part.endswith("}"):
+                name, _, spec = part[1:-1].partition(":")
+                if name:
+                    return None
+                if spec in types:
+                    # Custom types can define their own pattern with parse.with_pattern().
+                    if getattr(types[spec], "regex_group_count", None):
+                        return None
+                    regex.append(f"((?:{getattr(types[spec], 'pattern', '.+?')}))")
+                    self.converters.append(types[spec])
+                elif spec in STANDARD_TYPES:
+                    field_regex, converter = STANDARD_TYPES[spec]
+                    regex.append(f"({field_regex})")
+                    self.converters.append(converter)
+                else:
+                    return None
+            else:
+                regex.append(re.escape(part))
+        return "".join(regex)
+
+    def findall(self, text: str) -> list[Any]:
+        if self.regex is None:
+            if self._compiled is None:
+                self._compiled = parse.compile(self.pattern, extra_types=self.types)
+            return [r.fixed for r in self._compiled.findall(text)]
+        matches = self.regex.findall(text)
+        if not self.converters:
+            return [() for _ in matches]
+        if not matches:
+            return []
+        if len(self.converters) == 1:
+            matches = [(m,) for m in matches]
+        columns = [
+            list(map(converter, column)) if converter else column
+            for converter, column in zip(self.converters, zip(*matches, strict=True), strict=True)
+        ]
+        return list(zip(*columns, strict=True))
+
+    def findall_buffer(self, buffer: memoryview) -> list[Any]:
+        """
+        Like findall(), but directly on (memory mapped) raw input, so only the matched fields are decoded.
+        Like Problem.corrected_input, the newlines at the start and the whitespace at the end are left out, and a line
+        pattern also matches the last line when the input doesn't end with a newline.
+        """
+        start, end = content_bounds(buffer)
+        if self.regex is None:
+            return self.findall(bytes(buffer[start:end]).decode() + "\n")
+        if self._bytes_regex is None:
+            regex = self.regex.pattern
+            if regex.endswith(re.escape("\n")):
+                regex = regex.removesuffix(re.escape("\n")) + r"(?:\n|\Z)"
+            self._bytes_regex = re.compile(regex.encode(), self.regex.flags & ~re.UNICODE)
+        matches = self._bytes_regex.findall(buffer, start, end)
+        if not self.converters:
+            return [() for _ in matches]
+        if not matches:
+            return []
+        if len(self.converters) == 1:
+            matches = [(m,) for m in matches]
+        columns = [
+            # int() can handle bytes by itself, all other fields are decoded first.
+            list(map(converter, column if converter is int else map(bytes.decode, column)))
+            if converter else list(map(bytes.decode, column))
+            for converter, column in zip(self.converters, zip(*matches, strict=True), strict=True)
+        ]
+        return list(zip(*columns, strict=True))
+
+
+@cache
+def parser(module_name: str, pattern: str) -> Parser:
+    """The (compiled once) parser for a pattern of a day module."""
+    return Parser(pattern, extra_types(module_name))
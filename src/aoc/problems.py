@@ -2,16 +2,20 @@ import logging
 import sys
 import unicodedata
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from contextlib import nullcontext
+from enum import Enum
 from pathlib import Path
 from typing import ClassVar, Generic, NamedTuple, Self, TypeVar
 
 from more_itertools import strip
-from parse import findall  # type: ignore[import-untyped]
 from yachalk import chalk
 
 from aoc import AOC, InputMode
 from aoc.geo2d import E, Grid2
-from aoc.geo3d import P3D
+from aoc.memory import MemoryMonitor, MemoryUsage
+from aoc.parsing import parser
+from aoc.streaming import InputFile
 from aoc.utils import human_readable_duration, timed
 
 T = TypeVar("T")
@@ -22,21 +26,50 @@ def strlen(s: str) -> int:
     return sum((2 if unicodedata.east_asian_width(c) == "W" else 1) for c in s)
 
 
-def solution_lines(my_solution: T, actual_solution: T) -> list[str]:
-    mine: list[str] = my_solution.strip().splitlines() if isinstance(my_solution, str) else [str(my_solution)]
-    actual: list[str] = [""] if (
-        actual_solution is None
-    ) else actual_solution.strip().splitlines() if (
-        isinstance(actual_solution, str)
-    ) else [str(actual_solution)]
-    if len(mine) > 1:
-        mine = ["", *mine]
-    if len(actual) > 1:
-        actual = ["", *actual]
+def _solution_lines(solution: object) -> list[str]:
+    if solution is None:
+        return [""]
+    lines = solution.strip().splitlines() if isinstance(solution, str) else [str(solution)]
+    return ["", *lines] if len(lines) > 1 else lines
+
+
+class Outcome(Enum):
+    CORRECT = "correct"
+    WRONG = "wrong"
+    ATTEMPTED = "attempted"
+    NO_SOLUTION = "no solution"
+    ERROR = "error"
+    TIMEOUT = "timeout"
+    OOM = "out of memory"
+
+    @property
+    def emoji(self) -> str:
+        return {
+            Outcome.CORRECT: "🍻",
+            Outcome.WRONG: "💀",
+            Outcome.ATTEMPTED: "👾",
+            Outcome.NO_SOLUTION: "🤷",
+            Outcome.ERROR: "💥",
+            Outcome.TIMEOUT: "⌛",
+            Outcome.OOM: "🐘",
+        }[self]
+
+
+def check_solution(my_solution: T, actual_solution: T) -> Outcome:
+    actual = _solution_lines(actual_solution)
     if actual == [""]:
-        return ["Attempted solution... 👾", *mine]
-    if mine == actual:
-        return ["Correct solution! 🍻", *mine]
+        return Outcome.ATTEMPTED
+    return Outcome.CORRECT if _solution_lines(my_solution) == actual else Outcome.WRONG
+
+
+def solution_lines(my_solution: T, actual_solution: T) -> list[str]:
+    mine: list[str] = _solution_lines(my_solution) if my_solution is not None else ["None"]
+    actual = _solution_lines(actual_solution)
+    match check_solution(my_solution, actual_solution):
+        case Outcome.ATTEMPTED:
+            return ["Attempted solution... 👾", *mine]
+        case Outcome.CORRECT:
+            return ["Correct solution! 🍻", *mine]
     return ["Wrong solution! 💀"] + ([f"{mine[0]} <- your answer", f"{actual[0]} <- right answer"] if (
         len(mine) == 1 and len(actual) == 1
     ) else ["", "Your answer:", *mine, "", "Right answer:", *actual])
@@ -65,12 +98,61 @@ class FatalError(Exception):
         self.message = message
 
 
+class Durations(NamedTuple):
+    read: int = 0
+    process_input: int = 0
+    init: int = 0
+    solution: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self)
+
+    @property
+    def lines(self) -> list[str]:
+        labels = {"read": "read input", "process_input": "process input", "init": "init", "solution": "solution"}
+        width = max(len(label) for label in labels.values())
+        return [
+            f"{labels[phase]:>{width}}: {human_readable_duration(duration)}"
+            for phase, duration in self._asdict().items()
+        ]
+
+
+class Result(NamedTuple):
+    data: "Problem.Data"
+    input_mode: InputMode
+    outcome: Outcome
+    solution: object = None
+    durations: Durations = Durations()
+    error: str = ""
+    memory: MemoryUsage | None = None
+    cached: bool = False
+
+    @property
+    def duration(self) -> int:
+        return self.durations.total
+
+
+def log_box(lines: list[str]) -> None:
+    width = max(strlen(line) for line in lines)
+    logging.info(" " * (width + 4))
+    logging.info(" %s ", chalk.bg_hex("332")(" " * (width + 2)))
+    for line in lines:
+        logging.info(" %s ", chalk.bg_hex("332")(f" {line} {' ' * (width - strlen(line))}"))
+    logging.info(" %s ", chalk.bg_hex("332")(" " * (width + 2)))
+    logging.info(" " * (width + 4))
+
+
 class Problem(ABC, Generic[T]):
     class Data(NamedTuple):
         year: int
         day: int
         part: int
 
+        @property
+        def key(self) -> str:
+            return f"{self.year}/{self.day:02d}/{self.part}"
+
     data: ClassVar[Data]
 
     test_solution: T | None = None
@@ -80,71 +162,146 @@ class Problem(ABC, Generic[T]):
     input: str
     corrected_input: str
 
+    duration_read: int = 0
+    duration_process_input: int = 0
+
+    # Whether process_input() can work on a memory mapped input file (instead of the whole input as a string).
+    # Days opt in by themselves: input and corrected_input aren't set when streaming.
+    supports_streaming: ClassVar[bool] = False
+    input_file: InputFile | None = None
+
     def __new__(cls: type["Self"]) -> "Self":
         # Read input into problem instance before its actual __init__() will be called.
         self: Self = super().__new__(cls)
         if AOC.input_mode == InputMode.NONE:
             return self
+        if AOC.streaming_input and cls.supports_streaming and (path := cls.input_path()):
+            input_file, self.duration_read, _ = timed(lambda: cls.open_input(path))
+            self.input_file, self.line_count = input_file, input_file.line_count
+            _, self.duration_process_input, _ = timed(self.process_input)
+            return self
+        input_, self.duration_read, _ = timed(cls.read_input)
+        _, self.duration_process_input, _ = timed(lambda: self.set_input(input_))
+        return self
+
+    @classmethod
+    def input_path(cls) -> Path | None:
+        """The file to read the input from, or None if the (test) input is defined in the module itself."""
+        if AOC.input_path:
+            return AOC.input_path
         module = sys.modules[cls.__module__]
-        try:
-            if AOC.input_mode == InputMode.PUZZLE:
-                path = Path("input") / f"{cls.data.year}" / f"{cls.data.day:02d}.txt"
-                with path.open(encoding="utf8") as input_file:
-                    self.set_input(input_file.read())
-            else:
-                part_input = f"TEST_INPUT_{cls.data.part}"
-                self.set_input(getattr(module, part_input if (part_input in dir(module)) else "TEST_INPUT"))
-        except (OSError, AttributeError):
-            # fall back to legacy way of doing things with separate input files
-            file_name = "test_input.txt" if AOC.input_mode == InputMode.TEST else "input.txt"
-            path = Path(module.__file__ or ".").with_suffix("") / file_name
+        if AOC.input_mode == InputMode.PUZZLE:
+            path = Path("input") / f"{cls.data.year}" / f"{cls.data.day:02d}.txt"
+            if path.exists():
+                return path
+        elif f"TEST_INPUT_{cls.data.part}" in dir(module) or "TEST_INPUT" in dir(module):
+            return None
+        # fall back to legacy way of doing things with separate input files
+        file_name = "test_input.txt" if AOC.input_mode == InputMode.TEST else "input.txt"
+        return Path(module.__file__ or ".").with_suffix("") / file_name
+
+    @classmethod
+    def read_input(cls) -> str:
+        if path := cls.input_path():
             try:
                 with path.open(encoding="utf8") as input_file:
-                    self.set_input(input_file.read())
+                    return input_file.read()
             except OSError as exc:
                 msg = f"Could not find {AOC.input_mode.value} input!"
                 raise FatalError(msg) from exc
-        return self
+        module = sys.modules[cls.__module__]
+        part_input = f"TEST_INPUT_{cls.data.part}"
+        return getattr(module, part_input if (part_input in dir(module)) else "TEST_INPUT")
+
+    @classmethod
+    def open_input(cls, path: Path) -> InputFile:
+        try:
+            return InputFile(path)
+        except OSError as exc:
+            msg = f"Could not find {AOC.input_mode.value} input!"
+            raise FatalError(msg) from exc
 
     def set_input(self, input_: str) -> None:
+        cache = AOC.parse_cache
+        key = cache.key(type(self), input_) if cache else ""
+        if cache and (attributes := cache.get(key)) is not None:
+            vars(self).update(attributes)
+            return
+        existing = set(vars(self))
         self.input = input_
         self.corrected_input = input_.lstrip("\n").rstrip() + "\n"
         self.line_count = self.corrected_input.count("\n")
         self.process_input()
+        if cache:
+            cache.put(key, {k: v for k, v in vars(self).items() if k not in existing})
 
     @classmethod
-    def solve(cls, year: int, day: int, part: int, input_mode: InputMode, debugging: bool = False) -> None:
+    def given_solution(cls) -> T | None:
+        if AOC.input_path:
+            # Nobody knows the answers for other inputs.
+            return None
+        return cls.test_solution if AOC.input_mode == InputMode.TEST else cls.my_solution
+
+    @classmethod
+    def run(cls, year: int, day: int, part: int) -> "Result":
+        """Solve the problem for the current input mode, without reporting anything."""
         cls.data = cls.Data(year, day, part)
-        AOC.setup(input_mode, debugging)
+        cache = AOC.answer_cache
+        # Debugging output and memory usage only come with actually solving things.
+        if cache is None or AOC.debugging or AOC.measure_memory or AOC.input_mode == InputMode.NONE:
+            return cls._run()
         try:
-            problem, duration_init, _duration_init_str = timed(cls)
-            solution, duration_solution, _duration_solution_str = timed(problem.solution)
+            key = cache.key(cls, AOC.input_mode.value, cls.read_input())
+        except FatalError:
+            return cls._run()
+        if (cached := cache.get(key)) is not None:
+            solution, durations = cached
+            outcome = check_solution(solution, cls.given_solution())
+            return Result(cls.data, AOC.input_mode, outcome, solution, Durations(*durations), cached=True)
+        result = cls._run()
+        if result.outcome in (Outcome.CORRECT, Outcome.WRONG, Outcome.ATTEMPTED):
+            cache.put(key, result.solution, list(result.durations))
+        return result
+
+    @classmethod
+    def _run(cls) -> "Result":
+        monitor = MemoryMonitor() if AOC.measure_memory else None
+        try:
+            with monitor or nullcontext():
+                problem = cls.__new__(cls)
+                _, duration_init, _ = timed(problem.__init__)  # type: ignore[misc]
+                if monitor:
+                    monitor.next_phase()
+                solution, duration_solution, _ = timed(problem.solution)
         except NoSolutionFoundError:
-            lines = ["No solution found!? 🤷‍️"]
+            return Result(cls.data, AOC.input_mode, Outcome.NO_SOLUTION)
         except FatalError as exc:
-            logging.fatal(exc.message)
+            return Result(cls.data, AOC.input_mode, Outcome.ERROR, error=exc.message)
+        outcome = check_solution(solution, cls.given_solution())
+        return Result(cls.data, AOC.input_mode, outcome, solution, Durations(
+            problem.duration_read, problem.duration_process_input, duration_init, duration_solution,
+        ), memory=monitor.usage() if monitor else None)
+
+    @classmethod
+    def solve(cls, year: int, day: int, part: int, input_mode: InputMode, debugging: bool = False) -> None:
+        AOC.setup(input_mode, debugging)
+        result = cls.run(year, day, part)
+        if result.outcome == Outcome.NO_SOLUTION:
+            lines = ["No solution found!? 🤷‍️"]
+        elif result.outcome == Outcome.ERROR:
+            logging.fatal(result.error)
             lines = ["The process died before a solution could be found. 💀‍️"]
         else:
-            duration_total = duration_init + duration_solution
-            duration_str = human_readable_duration(duration_total)
-            if solution is None:
+            duration_str = human_readable_duration(result.duration)
+            if result.solution is None:
                 return
-            given_solution = cls.test_solution if input_mode == InputMode.TEST else cls.my_solution
-            lines = solution_lines(solution, given_solution)
-            lines += ["", f"Solved in {duration_str} {duration_emoji(duration_str)}"]
-            # if debugging:
-            #     lines += [
-            #         '-----------------------',
-            #         f'    init: {duration_init_str}',
-            #         f'solution: {duration_solution_str}',
-            #     ]
-        width = max(strlen(line) for line in lines)
-        logging.info(" " * (width + 4))
-        logging.info(" %s ", chalk.bg_hex("332")(" " * (width + 2)))
-        for line in lines:
-            logging.info(" %s ", chalk.bg_hex("332")(f" {line} {' ' * (width - strlen(line))}"))
-        logging.info(" %s ", chalk.bg_hex("332")(" " * (width + 2)))
-        logging.info(" " * (width + 4))
+            lines = solution_lines(result.solution, cls.given_solution())
+            cached = " (cached)" if result.cached else ""
+            lines += ["", f"Solved in {duration_str} {duration_emoji(duration_str)}{cached}", ""]
+            lines += result.durations.lines
+            if result.memory:
+                lines += ["", *result.memory.lines]
+        log_box(lines)
 
     @abstractmethod
     def process_input(self) -> None:
@@ -163,10 +320,22 @@ class OneLineProblem(Problem[T], ABC, Generic[T]):
 
 
 class MultiLineProblem(Problem[T], ABC, Generic[T]):
+    """
+    Input split into lines. Even when streaming, all lines are kept (and grid problems keep the grid as well):
+    only the copies of the whole input as one string are saved. Days that can process the lines one by one can
+    override process_input() to go through input_lines() instead.
+    """
+
     lines: list[str]
 
+    def input_lines(self) -> Iterable[str]:
+        """The lines without the empty ones at the start and the end, decoded only when needed if streaming."""
+        if self.input_file:
+            return self.input_file.lines()
+        return strip(self.corrected_input.splitlines(), lambda line: line == "")
+
     def process_input(self) -> None:
-        self.lines = list(strip(self.corrected_input.splitlines(), lambda line: line == ""))
+        self.lines = list(self.input_lines())
 
 
 class _GridProblem(MultiLineProblem[T], ABC, Generic[E, T]):
@@ -204,19 +373,11 @@ class ParsedProblem(Problem[T], ABC, Generic[R, T]):
         if not self.line_pattern and not self.multi_line_pattern:
             msg = "Either line_pattern or multi_line_pattern should be set."
             raise TypeError(msg)
-        prefix = "__parse_"
-        module = sys.modules[self.__module__]
-        extra_types = {
-            f[len(prefix):]: getattr(module, f)
-            for f in dir(module) if f.startswith(prefix)
-        } | {
-            "p3": P3D.from_str,
-        }
-        self.parsed_input = [r.fixed for r in findall(
-            self.multi_line_pattern or self.line_pattern + "\n",
-            self.corrected_input,
-            extra_types=extra_types,
-        )]
+        pattern = self.multi_line_pattern or self.line_pattern + "\n"
+        if self.input_file:
+            self.parsed_input = parser(self.__module__, pattern).findall_buffer(self.input_file.view)
+            return
+        self.parsed_input = parser(self.__module__, pattern).findall(self.corrected_input)
         # elif self._regex_pattern:
         #     rc = self._regex_converters or []
         #     self.parsed_regex = [
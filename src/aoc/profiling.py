@@ -0,0 +1,133 @@
+import cProfile
+import json
+import logging
+import pstats
+from collections import defaultdict
+from pathlib import Path
+
+import aoc
+from aoc.problems import Problem, Result
+from aoc.utils import human_readable_duration, log_table
+
+# (file name, line number, function name), as used by pstats
+Func = tuple[str, int, str]
+
+PACKAGE_DIR = Path(aoc.__file__).parent
+
+# Stacks that take less time than this (in microseconds) are left out of the flame graphs.
+MIN_STACK_TIME = 1
+
+
+def frame_name(func: Func) -> str:
+    file_name, line, name = func
+    if file_name == "~":
+        # Built-in function
+        return name
+    path = Path(file_name)
+    if path.is_relative_to(PACKAGE_DIR.parent):
+        path = path.relative_to(PACKAGE_DIR.parent)
+    return f"{name} ({path}:{line})" if line else f"{name} ({path})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[tuple[Func, ...], int]:
+    """
+    Reconstruct call stacks with their own time (in microseconds) from the profile.
+    cProfile only records caller/callee pairs, so the time of a function is divided over the stacks
+    it appears in according to how much of its time was spent on behalf of each of its callers.
+    """
+    entries = stats.stats  # type: ignore[attr-defined]
+    children: dict[Func, dict[Func, float]] = defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            children[caller][func] = cumulative
+    stacks: dict[tuple[Func, ...], int] = {}
+
+    def visit(stack: tuple[Func, ...], time: float) -> None:
+        func = stack[-1]
+        _, _, own, cumulative, _ = entries[func]
+        if cumulative <= 0:
+            return
+        if (own_time := round(time * own / cumulative * 1_000_000)) >= MIN_STACK_TIME:
+            stacks[stack] = own_time
+        for child, child_time in children[func].items():
+            # Recursion is folded into the first occurrence of a function.
+            if child not in stack and (time_in_child := time * child_time / cumulative) * 1_000_000 >= MIN_STACK_TIME:
+                visit((*stack, child), time_in_child)
+
+    for func, (_, _, _, cumulative, callers) in entries.items():
+        if not callers:
+            visit((func,), cumulative)
+    return stacks
+
+
+def write_collapsed(stacks: dict[tuple[Func, ...], int], path: Path) -> None:
+    """Write stacks in the collapsed format of flamegraph.pl, inferno and the like."""
+    with path.open("w", encoding="utf8") as f:
+        for stack, time in stacks.items():
+            f.write(f"{';'.join(frame_name(func).replace(';', ':') for func in stack)} {time}\n")
+
+
+def write_speedscope(stacks: dict[tuple[Func, ...], int], path: Path, name: str) -> None:
+    """Write stacks as a sampled profile for https://www.speedscope.app"""
+    frames: dict[Func, int] = {}
+    samples = [[frames.setdefault(func, len(frames)) for func in stack] for stack in stacks]
+    weights = list(stacks.values())
+    with path.open("w", encoding="utf8") as f:
+        json.dump({
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "aoc",
+            "shared": {"frames": [
+                {"name": func[2], "file": func[0], "line": func[1]} if func[0] != "~" else {"name": func[2]}
+                for func in frames
+            ]},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "microseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }, f)
+
+
+def report(stats: pstats.Stats, top: int) -> None:
+    """Log the functions of the aoc package that take the most time by themselves."""
+    entries = stats.stats  # type: ignore[attr-defined]
+    hot = sorted(
+        ((func, entry) for func, entry in entries.items() if Path(func[0]).is_relative_to(PACKAGE_DIR)),
+        key=lambda item: -item[1][2],
+    )[:top]
+    log_table([
+        ["Function", "Calls", "Own time", "Total time"],
+        *([
+            frame_name(func),
+            f"{calls}/{primitive_calls}" if calls != primitive_calls else calls,
+            human_readable_duration(int(own * 1_000_000_000)),
+            human_readable_duration(int(cumulative * 1_000_000_000)),
+        ] for func, (primitive_calls, calls, own, cumulative, _) in hot),
+    ])
+
+
+def profile(problem_cls: type[Problem], data: Problem.Data, output_dir: Path, top: int = 20) -> Result:
+    """
+    Solve a part under cProfile (construction with input processing included) and write the profile
+    as pstats, collapsed stacks (for flame graph tools) and speedscope JSON to the output directory.
+    """
+    profiler = cProfile.Profile()
+    result: Result = profiler.runcall(problem_cls.run, *data)
+    stats = pstats.Stats(profiler)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    name = f"{data.year}_{data.day:02d}_{data.part}"
+    stats.dump_stats(pstats_path := output_dir / f"{name}.pstats")
+    stacks = collapsed_stacks(stats)
+    write_collapsed(stacks, collapsed_path := output_dir / f"{name}.folded")
+    write_speedscope(stacks, speedscope_path := output_dir / f"{name}.speedscope.json", data.key)
+    report(stats, top)
+    logging.info(" ")
+    logging.info(" %s %s: %s", result.outcome.emoji, data.key, result.outcome.value)
+    for path in (pstats_path, collapsed_path, speedscope_path):
+        logging.info(" Wrote %s", path)
+    return result
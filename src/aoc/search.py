@@ -1,21 +1,131 @@
 from __future__ import annotations
 
+import json
 import logging
+import os
 from abc import ABC, abstractmethod
-from collections import deque
-from queue import PriorityQueue, Queue
-from typing import TYPE_CHECKING, Generic, Self, TypeVar
+from array import array
+from collections import Counter, deque
+from collections.abc import Hashable
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from functools import partial
+from heapq import heapify, heappop, heappush
+from itertools import count
+from math import ceil
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, Self, TypeVar, overload
+
+from aoc import AOC
+from aoc.utils import debug_table, human_readable_duration
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
+    from collections.abc import Callable, Container, Iterable, Iterator
+    from pathlib import Path
+
+    # Next states of a packed state, with the cost of getting there
+    Expand = Callable[[int], Iterable[tuple[int, int]]]
 
 S = TypeVar("S", bound="State")
 
+if TYPE_CHECKING:
+    # What makes a search stop: a predicate on states, or the keys of the states to reach
+    Targets = Callable[[S], bool] | Container[Hashable]
+
+
+class PathMode(Enum):
+    # Every state keeps a reference to the previous one (and so all of its predecessors).
+    FULL = "full"
+    # Only the variables of the best predecessor of every state are kept, the path is rebuilt on demand.
+    PARENTS = "parents"
+    # Only the length of the path is known, states can be garbage collected as soon as they're expanded.
+    NONE = "none"
+
+
+@dataclass
+class SearchStats:
+    """What a search did, to tune engines and heuristics. Only collected when AOC.search_stats is a list."""
+
+    engine: str
+    state: str
+    # States taken from the queue (including the one the search stopped at), and the ones that were expanded
+    popped: int = 0
+    expanded: int = 0
+    # Next states of the expanded states, and the ones that weren't queued (reached before at a lower cost)
+    generated: int = 0
+    duplicates: int = 0
+    queued: int = 0
+    # Queued again at a lower cost before being expanded
+    reopened: int = 0
+    # Taken from the queue but skipped (expanded before, or a cheaper way to it was queued later)
+    stale: int = 0
+    max_frontier: int = 0
+    duration: int = 0
+    # Number of expanded states by cost
+    costs: Counter[int] = field(default_factory=Counter)
+
+    @property
+    def time_per_expansion(self) -> int:
+        return self.duration // self.expanded if self.expanded else 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self) | {"time_per_expansion": self.time_per_expansion, "costs": dict(sorted(self.costs.items()))}
+
+    def histogram(self, buckets: int = 10) -> list[tuple[str, int]]:
+        """
+        Expanded states per cost range.
+
+        >>> SearchStats("", "", costs=Counter({0: 1, 1: 4, 2: 6, 5: 2})).histogram(3)
+        [('0-1', 5), ('2-3', 6), ('4-5', 2)]
+        """
+        if not self.costs:
+            return []
+        low, high = min(self.costs), max(self.costs)
+        width = ceil((high - low + 1) / buckets)
+        counts = Counter[int]()
+        for cost, n in self.costs.items():
+            counts[(cost - low) // width] += n
+        return [
+            (f"{low + i * width}" if width == 1 else f"{low + i * width}-{low + (i + 1) * width - 1}", counts[i])
+            for i in range((high - low) // width + 1)
+        ]
+
+    def log(self) -> None:
+        debug_table([
+            ("Search", f"{self.engine} of {self.state}"),
+            ("Popped", f"{self.popped} ({self.stale} stale)"),
+            ("Expanded", f"{self.expanded} ({human_readable_duration(self.time_per_expansion)} each)"),
+            ("Duration", human_readable_duration(self.duration)),
+            ("Generated", f"{self.generated} ({self.duplicates} duplicates)"),
+            ("Queued", f"{self.queued} ({self.reopened} reopened)"),
+            ("Max frontier", self.max_frontier),
+            *((f"Cost {costs}", n) for costs, n in self.histogram()),
+        ])
+
+
+def write_stats(stats: list[SearchStats], path: Path) -> None:
+    with path.open("w", encoding="utf8") as f:
+        json.dump([s.as_dict() for s in stats], f, indent=2)
+
+
+def _is_finished(state: State) -> bool:
+    return state.is_finished
+
 
 class ShortestPath(ABC, Generic[S]):
-    def __init__(self, initial_state: S):
-        self.end_state = self._initial_state = initial_state
-        self.visited = set[S]()
+    def __init__(self, initial_state: S, *more_initial_states: S):
+        self.end_state = initial_state
+        self._initial_states = (initial_state, *more_initial_states)
+        # Keys of the states that were visited (the states themselves aren't kept).
+        self.visited = set[Hashable]()
+        # Lowest cost found so far of the states (by key)
+        self._costs: dict[Hashable, int] = {}
+        # Key, variables and cost of the best predecessor of a state (only in PathMode.PARENTS)
+        self._parents: dict[Hashable, tuple[Hashable, Any, int]] = {}
+        self._max_cost: int | None = None
+        self.stats = SearchStats(
+            self.__class__.__name__, initial_state.__class__.__name__,
+        ) if AOC.search_stats is not None else None
 
     @abstractmethod
     def from_queue(self) -> Iterator[S]:
@@ -25,21 +135,93 @@ class ShortestPath(ABC, Generic[S]):
     def to_queue(self, state: S) -> None:
         pass
 
-    def find(self: Self) -> Self:
-        state = self._initial_state
-        self.to_queue(state)
+    @property
+    @abstractmethod
+    def frontier_size(self) -> int:
+        """Number of states in the queue (stale ones included)."""
+
+    def find(self: Self, targets: Targets[S] | None = _is_finished, max_cost: int | None = None) -> Self:
+        """
+        Search until a target is reached (by default: a state that is finished), or without targets:
+        until every state within the maximum cost (if any) is reached.
+        """
+        start, stats = perf_counter_ns(), self.stats
+        state = self.seed(stats)[0]
+        is_target = targets if targets is None or callable(targets) else lambda s: s.hash_key in targets
+        self._max_cost = max_cost
+        record_parents = state.path_mode is PathMode.PARENTS
         for state in self.from_queue():
-            if state.is_finished:
+            if (is_target and is_target(state)) or (max_cost is not None and state.cost > max_cost):
+                if stats is not None:
+                    stats.popped += 1
                 break
-            for next_state in state.next_states:
-                if next_state not in self.visited and self._handle_state(next_state):
-                    self.to_queue(next_state)
-            self._on_state_processed(state)
+            self.expand(state, state.next_states, record_parents, stats)
         else:
-            logging.warning("Queue empty before reaching the end criteria at state:\n%s", state)
+            if is_target:
+                logging.warning("Queue empty before reaching the end criteria at state:\n%s", state)
         self.end_state = state
+        self._record_stats(perf_counter_ns() - start)
         return self
 
+    def _record_stats(self, duration: int) -> None:
+        if (stats := self.stats) is None or AOC.search_stats is None:
+            return
+        stats.stale = stats.queued - stats.popped - self.frontier_size
+        stats.duration = duration
+        stats.log()
+        AOC.search_stats.append(stats)
+
+    def seed(self, stats: SearchStats | None = None) -> list[S]:
+        """Queue the initial states."""
+        for state in self._initial_states:
+            if self._handle_state(state):
+                self.to_queue(state)
+                if stats is not None:
+                    stats.queued += 1
+        return list(self._initial_states)
+
+    def expand(
+        self, state: S, next_states: Iterable[S], record_parents: bool = False, stats: SearchStats | None = None,
+    ) -> list[S]:
+        """Queue the next states of a state that weren't reached before (or only at a higher cost)."""
+        if stats is not None:
+            return self._expand_counted(state, next_states, record_parents, stats)
+        visited, queued = self.visited, []
+        for next_state in next_states:
+            if next_state.hash_key not in visited and self._handle_state(next_state):
+                if record_parents:
+                    self._parents[next_state.hash_key] = state.hash_key, state.v, state.cost
+                self.to_queue(next_state)
+                queued.append(next_state)
+        self._on_state_processed(state)
+        return queued
+
+    def _expand_counted(
+        self, state: S, next_states: Iterable[S], record_parents: bool, stats: SearchStats,
+    ) -> list[S]:
+        next_states = list(next_states)
+        reached = {id(s) for s in next_states if self.cost(s.hash_key) is not None}
+        queued = self.expand(state, next_states, record_parents)
+        stats.popped += 1
+        stats.expanded += 1
+        stats.costs[state.cost] += 1
+        stats.generated += len(next_states)
+        stats.duplicates += len(next_states) - len(queued)
+        stats.queued += len(queued)
+        stats.reopened += sum(id(s) in reached for s in queued)
+        stats.max_frontier = max(stats.max_frontier, self.frontier_size)
+        return queued
+
+    def cost(self, key: Hashable) -> int | None:
+        """Lowest cost found so far of the state with this key (if it was reached)."""
+        return self._costs.get(key)
+
+    def ancestors(self, key: Hashable) -> Iterator[tuple[Hashable, Any, int]]:
+        """Key, variables and cost of the best predecessors of the state with this key (only in PathMode.PARENTS)."""
+        while (parent := self._parents.get(key)) is not None:
+            yield parent
+            key = parent[0]
+
     def _on_state_processed(self, state: S) -> None:
         pass
 
@@ -50,19 +232,38 @@ class ShortestPath(ABC, Generic[S]):
     @property
     def states(self) -> list[S]:
         """Get the complete path by traversing back to the start."""
-        return list(reversed(list(self.end_state.prev_states)))
+        end = self.end_state
+        if end.path_mode is PathMode.FULL:
+            return list(reversed(list(end.prev_states)))
+        if end.path_mode is PathMode.NONE:
+            msg = f"The path is not recorded by {type(end).__name__} (path mode {end.path_mode.value})"
+            raise ValueError(msg)
+        steps = [(end.hash_key, end.v, end.cost), *self.ancestors(end.hash_key)]
+        states: list[S] = []
+        for _, v, cost in reversed(steps):
+            states.append(end.__class__(v, states[-1] if states else None, cost))
+        return states
 
     @property
     def length(self) -> int:
         return self.end_state.cost
 
+    @property
+    def distances(self) -> dict[Hashable, int]:
+        """Lowest cost of every state (by key) that was reached (within the maximum cost)."""
+        max_cost = self._max_cost
+        return {
+            key: cost for key, cost in self._costs.items()
+            if key in self.visited and (max_cost is None or cost <= max_cost)
+        }
+
 
 B = TypeVar("B", bound="BFSState")
 
 
 class ShortestPathBFS(ShortestPath[B], Generic[B]):
-    def __init__(self, initial_state: B) -> None:
-        super().__init__(initial_state)
+    def __init__(self, initial_state: B, *more_initial_states: B) -> None:
+        super().__init__(initial_state, *more_initial_states)
         self._queue: deque[B] = deque()
 
     def from_queue(self) -> Iterator[B]:
@@ -72,8 +273,13 @@ class ShortestPathBFS(ShortestPath[B], Generic[B]):
     def to_queue(self, state: B) -> None:
         self._queue.append(state)
 
+    @property
+    def frontier_size(self) -> int:
+        return len(self._queue)
+
     def _handle_state(self, state: B) -> bool:
-        self.visited.add(state)
+        self.visited.add(key := state.hash_key)
+        self._costs[key] = state.cost
         return True
 
 
@@ -81,51 +287,238 @@ D = TypeVar("D", bound="DijkstraState")
 
 
 class ShortestPathDijkstra(ShortestPath[D], Generic[D]):
-    def __init__(self, initial_state: D) -> None:
-        super().__init__(initial_state)
-        self._queue: Queue[D] = PriorityQueue()
-        self._costs: dict[D, int] = {}
+    def __init__(self, initial_state: D, *more_initial_states: D) -> None:
+        super().__init__(initial_state, *more_initial_states)
+        # Heap of (priority, insertion order, state): ties are broken by the counter, so states are never compared.
+        self._queue: list[tuple[int, int, D]] = []
+        self._counter = count()
 
     def from_queue(self) -> Iterator[D]:
-        while not self._queue.empty():
-            yield self._queue.get_nowait()
+        queue, costs, visited = self._queue, self._costs, self.visited
+        while queue:
+            _, _, state = heappop(queue)
+            if (key := state.hash_key) in visited or state.cost > costs.get(key, state.cost):
+                # Already expanded, or a cheaper way to this state was queued after this one.
+                continue
+            yield state
 
     def to_queue(self, state: D) -> None:
-        self._queue.put_nowait(state)
+        heappush(self._queue, (state.priority, next(self._counter), state))
+
+    @property
+    def frontier_size(self) -> int:
+        return len(self._queue)
 
     def _on_state_processed(self, state: D) -> None:
-        self.visited.add(state)
+        self.visited.add(state.hash_key)
 
     def _handle_state(self, state: D) -> bool:
-        if (old_cost := self._costs.get(state)) and state.cost >= old_cost:
+        if (old_cost := self._costs.get(key := state.hash_key)) is not None and state.cost >= old_cost:
             # you can do better than that
             return False
         # most efficient route to this state so far: update cost
-        self._costs[state] = state.cost
+        self._costs[key] = state.cost
         return True
 
 
+L = TypeVar("L", bound="DialState")
+
+
+class ShortestPathDial(ShortestPathDijkstra[L], Generic[L]):
+    """
+    Dial's algorithm: a bucket queue for when priorities only go up by small integers (like grid digits).
+    Bucket i holds the states with priority i modulo the number of buckets, and is emptied before going to the next.
+    Pushing and popping are O(1), no heap needed.
+    """
+
+    def __init__(self, initial_state: L, *more_initial_states: L) -> None:
+        super().__init__(initial_state, *more_initial_states)
+        self._max_weight = initial_state.max_weight
+        self._buckets: list[list[L]] = [[] for _ in range(self._max_weight + 1)]
+        self._priority = min(state.priority for state in self._initial_states)
+        self._size = 0
+
+    def from_queue(self) -> Iterator[L]:
+        buckets, costs, visited = self._buckets, self._costs, self.visited
+        while self._size:
+            bucket = buckets[self._priority % len(buckets)]
+            while bucket:
+                state = bucket.pop()
+                self._size -= 1
+                if (key := state.hash_key) in visited or state.cost > costs.get(key, state.cost):
+                    continue
+                yield state
+            self._priority += 1
+
+    def to_queue(self, state: L) -> None:
+        if not 0 <= state.priority - self._priority <= self._max_weight:
+            msg = f"Priority of {state} is not within {self._max_weight} of the current priority {self._priority}"
+            raise ValueError(msg)
+        self._buckets[state.priority % len(self._buckets)].append(state)
+        self._size += 1
+
+    @property
+    def frontier_size(self) -> int:
+        return self._size
+
+
+class _CostOrderedDijkstra(ShortestPathDijkstra[D], Generic[D]):
+    # A heuristic only works in one direction, so both halves of a bidirectional search go by cost.
+    def to_queue(self, state: D) -> None:
+        heappush(self._queue, (state.cost, next(self._counter), state))
+
+
+class ShortestPathBidirectional(ShortestPath[S], Generic[S]):
+    """
+    Searches forward from the initial states and backward (over State.reverse_states) from one goal state at once,
+    expanding the side that got the least far so far, until the two searches meet.
+    In a grid, both sides cover a circle of half the radius, so about half the states of a one-sided search.
+    """
+
+    engine_cls: ClassVar[type[ShortestPath]]
+
+    def __init__(self, initial_state: S, *more_initial_states: S, goal: S) -> None:
+        super().__init__(initial_state, *more_initial_states)
+        self.goal = goal
+        self.forward: ShortestPath[S] = self.engine_cls(initial_state, *more_initial_states)
+        self.backward: ShortestPath[S] = self.engine_cls(goal)
+        # Both sides are counted together.
+        self.forward.stats = self.backward.stats = None
+        # Cost of the shortest path found so far, through the state with this key and variables
+        self._meeting: tuple[int, Hashable, Any] | None = None
+
+    def from_queue(self) -> Iterator[S]:
+        return self.forward.from_queue()
+
+    def to_queue(self, state: S) -> None:
+        self.forward.to_queue(state)
+
+    @property
+    def frontier_size(self) -> int:
+        return self.forward.frontier_size + self.backward.frontier_size
+
+    def _handle_state(self, state: S) -> bool:  # noqa: ARG002
+        # Only for the ShortestPath interface, the searching is done by the two engines.
+        return True
+
+    def _meet(self, states: Iterable[S], other: ShortestPath[S]) -> None:
+        for state in states:
+            if (other_cost := other.cost(key := state.hash_key)) is not None and (
+                self._meeting is None or state.cost + other_cost < self._meeting[0]
+            ):
+                self._meeting = state.cost + other_cost, key, state.v
+
+    def find(self: Self, targets: Targets[S] | None = None, max_cost: int | None = None) -> Self:  # noqa: ARG002
+        """Search until the searches meet (the goal is the target, not finished states), within the maximum cost."""
+        start, stats, sides = perf_counter_ns(), self.stats, (self.forward, self.backward)
+        self._meet(self.forward.seed(stats), self.backward)
+        self._meet(self.backward.seed(stats), self.forward)
+        queues = [side.from_queue() for side in sides]
+        # Cost of the last state taken from the queue of each side: nothing cheaper is left in there.
+        radius = [0, 0]
+        record_parents = self.goal.path_mode is not PathMode.NONE
+        while (current := next(queues[i := 0 if radius[0] <= radius[1] else 1], None)) is not None:
+            # Any path through states that are still queued costs at least the sum of both radii.
+            total = current.cost + radius[1 - i]
+            if (self._meeting is not None and total >= self._meeting[0]) or (max_cost is not None and total > max_cost):
+                if stats is not None:
+                    stats.popped += 1
+                break
+            radius[i] = current.cost
+            next_states = current.next_states if i == 0 else current.reverse_states
+            self._meet(sides[i].expand(current, next_states, record_parents, stats), sides[1 - i])
+            if stats is not None:
+                stats.max_frontier = max(stats.max_frontier, self.frontier_size)
+        self.visited = self.forward.visited | self.backward.visited
+        self._record_stats(perf_counter_ns() - start)
+        if self._meeting is None:
+            logging.warning("No path between the initial states and the goal:\n%s", self.goal)
+            return self
+        self.end_state = self.states[-1] if record_parents else self.goal.__class__(self.goal.v, None, self._meeting[0])
+        return self
+
+    @property
+    def states(self) -> list[S]:
+        """The path through the meeting point: the forward half, and the backward half the other way around."""
+        if self._meeting is None or self.goal.path_mode is PathMode.NONE:
+            return super().states
+        total, key, meeting_v = self._meeting
+        forward_steps = [(meeting_v, self.forward.cost(key)), *((v, cost) for _, v, cost in self.forward.ancestors(key))]
+        backward_steps = [(v, total - cost) for _, v, cost in self.backward.ancestors(key)]
+        states: list[S] = []
+        for v, cost in [*reversed(forward_steps), *backward_steps]:
+            states.append(self.goal.__class__(v, states[-1] if states else None, cost))
+        return states
+
+    @property
+    def distances(self) -> dict[Hashable, int]:
+        msg = "A bidirectional search only knows the distances of the states from one of both ends"
+        raise ValueError(msg)
+
+
+class ShortestPathBidirectionalBFS(ShortestPathBidirectional[B], Generic[B]):
+    engine_cls = ShortestPathBFS
+
+
+class ShortestPathBidirectionalDijkstra(ShortestPathBidirectional[D], Generic[D]):
+    engine_cls = _CostOrderedDijkstra
+
+
 C = TypeVar("C")
 V = TypeVar("V")
 
 
 class State(ABC, Generic[C, V]):
     path_finder_cls: type[ShortestPath]
+    bidirectional_path_finder_cls: type[ShortestPathBidirectional]
+    path_mode: ClassVar[PathMode] = PathMode.FULL
     c: C
 
     v: V
     prev: Self | None
     cost: int
+    hash_key: Hashable
 
     def __init__(self: Self, variables: V, prev: Self | None = None, cost: int = 0):
         self.v = variables
         self.prev = prev
         self.cost = cost
+        # The engines need the key a couple of times for every state.
+        self.hash_key = self.key()
+
+    @classmethod
+    def find_path(
+        cls: type[Self],
+        variables: V | None,
+        constants: C,
+        *,
+        sources: Iterable[V] = (),
+        targets: Targets[Self] | None = None,
+    ) -> ShortestPath[Self]:
+        """
+        Shortest path from the state with the variables (and/or any of the sources) to a target:
+        a finished state, unless other targets are given.
+        """
+        cls.c = constants
+        states = [cls(v) for v in ([variables] if variables is not None else []) + list(sources)]
+        return cls.path_finder_cls(*states).find(_is_finished if targets is None else targets)
 
     @classmethod
-    def find_path(cls: type[Self], variables: V, constants: C) -> ShortestPath[Self]:
+    def distances_from(
+        cls: type[Self],
+        sources: Iterable[V],
+        constants: C,
+        max_cost: int | None = None,
+    ) -> dict[Hashable, int]:
+        """Lowest cost of reaching every state (by key) from any of the sources, within the maximum cost."""
         cls.c = constants
-        return cls(variables).find_path_from_current_state()
+        return cls.path_finder_cls(*(cls(v) for v in sources)).find(None, max_cost).distances
+
+    @classmethod
+    def find_path_between(cls: type[Self], sources: Iterable[V], goal: V, constants: C) -> ShortestPath[Self]:
+        """Shortest path from any of the sources to the goal, searching from both ends (see reverse_states)."""
+        cls.c = constants
+        return cls.bidirectional_path_finder_cls(*(cls(v) for v in sources), goal=cls(goal)).find()
 
     def find_path_from_current_state(self: Self) -> ShortestPath[Self]:
         return self.path_finder_cls(self).find()
@@ -140,6 +533,15 @@ class State(ABC, Generic[C, V]):
     def next_states(self: Self) -> Iterable[Self]:
         pass
 
+    @property
+    def reverse_states(self: Self) -> Iterable[Self]:
+        """
+        States from which this state can be reached in one move, at the cost of that move (for bidirectional search):
+        the next states backwards. The cost of the states is the cost of getting from there to the goal.
+        """
+        msg = f"{self.__class__.__name__} can't be searched backwards"
+        raise NotImplementedError(msg)
+
     @property
     def prev_states(self) -> Iterator[Self]:
         state: Self | None = self
@@ -148,44 +550,310 @@ class State(ABC, Generic[C, V]):
             yield state
             state = state.prev
 
+    def key(self) -> Hashable:
+        """
+        What makes a state unique in a search: its variables, unless they aren't hashable or slow to hash
+        (see aoc.utils.pack_ints() and pack_bytes() for compact keys).
+        """
+        return self.v
+
     def move(self: Self, distance: int = 1, **kwargs) -> Self:
-        return self.__class__(self.v.__class__(**kwargs), self, self.cost + distance)
+        prev = self if self.path_mode is PathMode.FULL else None
+        return self.__class__(self.v.__class__(**kwargs), prev, self.cost + distance)
 
     def __hash__(self) -> int:
-        return hash(self.v)
+        return hash(self.hash_key)
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, State):
-            return self.v == other.v
+            return self.hash_key == other.hash_key
         return NotImplemented
 
+    def __reduce__(self) -> tuple[type[Self], tuple[V, None, int]]:
+        # Pickled without the path that led to it (which can be too long for pickle to recurse through),
+        # the constants are a class attribute and have to be set on the other side.
+        return self.__class__, (self.v, None, self.cost)
+
 
 class BFSState(State[C, V], ABC, Generic[C, V]):
     path_finder_cls = ShortestPathBFS
+    bidirectional_path_finder_cls = ShortestPathBidirectionalBFS
 
 
 class DijkstraState(State[C, V], ABC, Generic[C, V]):
     path_finder_cls = ShortestPathDijkstra
+    bidirectional_path_finder_cls = ShortestPathBidirectionalDijkstra
+
+    @property
+    def priority(self) -> int:
+        """States with a lower priority value are taken from the queue first."""
+        return self.cost
 
     def __lt__(self, other: object) -> bool:
-        """By defining this, states with a lower cost will have priority in the queue."""
         if isinstance(other, DijkstraState):
-            return self.cost < other.cost
+            return self.priority < other.priority
         return NotImplemented
 
 
+class DialState(DijkstraState[C, V], ABC, Generic[C, V]):
+    """Dijkstra with a bucket queue, for states of which the next states have a priority at most max_weight higher."""
+
+    path_finder_cls = ShortestPathDial
+    max_weight: int = 1
+
+
 class AStarState(DijkstraState[C, V], ABC, Generic[C, V]):
     def __init__(self: Self, variables: V, prev: Self | None = None, cost: int = 0):
         super().__init__(variables, prev, cost)
         self.score = self.cost + self.heuristic
 
-    def __lt__(self, other: object) -> bool:
-        """By defining this, states with a lower score (cost + heuristic) will have priority in the queue."""
-        if isinstance(other, AStarState):
-            return self.score < other.score
-        return NotImplemented
+    @property
+    def priority(self) -> int:
+        """States with a lower score (cost + heuristic) have priority in the queue."""
+        return self.score
 
     @property
     @abstractmethod
     def heuristic(self) -> int:
         """Basically turns the Dijkstra algo into A*"""
+
+
+class PackedSearch:
+    """
+    Low-level alternative to the State classes, for big searches (mostly grids) where allocating a state object
+    and hashing its variables for every step is what takes the time. States are packed into ints 0 <= n < size
+    by the caller (e.g. (y * width + x) * 4 + direction), expand(n) yields the next states with their weights.
+    Distances and predecessors live in preallocated arrays indexed by the packed states, so nothing gets hashed.
+    Priorities are plain ints on a heap, or go into buckets when max_weight is given (see ShortestPathDial).
+    """
+
+    def __init__(self, size: int, expand: Expand, max_weight: int | None = None):
+        self.size = size
+        self.expand = expand
+        self.max_weight = max_weight
+        # Distance from the nearest source (-1: not reached) and where it came from (-1: it's a source).
+        self.dist = array("i", [-1]) * size
+        self.prev = array("i", [-1]) * size
+        self._done = bytearray(size)
+        self.end = -1
+
+    def find(self, sources: Iterable[int], is_finished: Callable[[int], bool] | None = None) -> Self:
+        """
+        Search from one or more sources until a state is finished (or everything reachable was reached,
+        if no end criteria are given).
+        """
+        start = perf_counter_ns()
+        sources = list(sources)
+        for source in sources:
+            self.dist[source] = 0
+        stats = SearchStats(
+            self.__class__.__name__, getattr(self.expand, "__qualname__", "int"), queued=len(sources),
+        ) if AOC.search_stats is not None else None
+        expand = self.expand if stats is None else partial(self._expand_counted, stats)
+        if self.max_weight is None:
+            frontier = self._find_heap(sources, is_finished, expand, stats)
+        else:
+            frontier = self._find_buckets(sources, is_finished, expand, stats)
+        if stats is not None and AOC.search_stats is not None:
+            stats.popped = stats.expanded + (self.end >= 0)
+            stats.stale = stats.queued - stats.popped - frontier
+            stats.duration = perf_counter_ns() - start
+            stats.log()
+            AOC.search_stats.append(stats)
+        return self
+
+    def _expand_counted(self, stats: SearchStats, n: int) -> list[tuple[int, int]]:
+        """The next states of a state, counting what the search will do with them (like ShortestPath.expand())."""
+        dist, done, d = self.dist, self._done, self.dist[n]
+        next_states = list(self.expand(n))
+        stats.expanded += 1
+        stats.costs[d] += 1
+        stats.generated += len(next_states)
+        for m, weight in next_states:
+            if not done[m] and ((dm := dist[m]) < 0 or d + weight < dm):
+                stats.queued += 1
+                stats.reopened += dm >= 0
+            else:
+                stats.duplicates += 1
+        return next_states
+
+    def _find_heap(
+        self, sources: list[int], is_finished: Callable[[int], bool] | None, expand: Expand, stats: SearchStats | None,
+    ) -> int:
+        """Search with a heap as queue, returns the number of states left in it."""
+        dist, prev, done = self.dist, self.prev, self._done
+        queue = [(0, source) for source in sources]
+        heapify(queue)
+        while queue:
+            d, n = heappop(queue)
+            if done[n]:
+                continue
+            done[n] = 1
+            if is_finished and is_finished(n):
+                self.end = n
+                return len(queue)
+            for m, weight in expand(n):
+                if not done[m] and ((dm := dist[m]) < 0 or d + weight < dm):
+                    dist[m], prev[m] = d + weight, n
+                    heappush(queue, (d + weight, m))
+            if stats is not None:
+                stats.max_frontier = max(stats.max_frontier, len(queue))
+        if is_finished:
+            logging.warning("Queue empty before reaching the end criteria")
+        return 0
+
+    def _find_buckets(
+        self, sources: list[int], is_finished: Callable[[int], bool] | None, expand: Expand, stats: SearchStats | None,
+    ) -> int:
+        """Search with buckets as queue, returns the number of states left in them."""
+        dist, prev, done, max_weight = self.dist, self.prev, self._done, self.max_weight or 0
+        buckets: list[list[int]] = [[] for _ in range(max_weight + 1)]
+        buckets[0].extend(sources)
+        size, d = len(sources), 0
+        while size:
+            bucket = buckets[d % len(buckets)]
+            while bucket:
+                n = bucket.pop()
+                size -= 1
+                if done[n] or dist[n] != d:
+                    continue
+                done[n] = 1
+                if is_finished and is_finished(n):
+                    self.end = n
+                    return size
+                for m, weight in expand(n):
+                    if not done[m] and ((dm := dist[m]) < 0 or d + weight < dm):
+                        if not 0 <= weight <= max_weight:
+                            msg = f"Priority {d + weight} of {m} is not within {max_weight} of the current priority {d}"
+                            raise ValueError(msg)
+                        dist[m], prev[m] = d + weight, n
+                        buckets[(d + weight) % len(buckets)].append(m)
+                        size += 1
+                if stats is not None:
+                    stats.max_frontier = max(stats.max_frontier, size)
+            d += 1
+        if is_finished:
+            logging.warning("Queue empty before reaching the end criteria")
+        return 0
+
+    @property
+    def length(self) -> int:
+        if self.end < 0:
+            msg = "No finished state was reached"
+            raise ValueError(msg)
+        return self.dist[self.end]
+
+    @property
+    def states(self) -> list[int]:
+        """The packed states of the path, from the source to the end."""
+        path = []
+        n = self.end
+        while n >= 0:
+            path.append(n)
+            n = self.prev[n]
+        return path[::-1]
+
+    @property
+    def visited(self) -> int:
+        """Number of states that were expanded."""
+        return self._done.count(1)
+
+
+R = TypeVar("R")
+
+# Fewer jobs than this are run in the process itself
+POOL_MIN_JOBS = 8
+
+
+class _Worker:
+    """What a process of the pool of path_lengths() and distance_maps() searches with: set once by the initializer, shared by all jobs."""
+
+    state_cls: ClassVar[type[State]]
+    constants: ClassVar[list[Any]]
+
+    @classmethod
+    def setup(cls, state_cls: type[State], constants: list[Any]) -> None:
+        cls.state_cls, cls.constants = state_cls, constants
+
+    @classmethod
+    def length(cls, job: tuple[Any, int]) -> int:
+        variables, c = job
+        return cls.state_cls.find_path(variables, cls.constants[c]).length
+
+    @classmethod
+    def distances(
+        cls, job: tuple[Any, int], max_cost: int | None, summarize: Callable[[dict[Hashable, int]], Any] | None,
+    ) -> Any:
+        variables, c = job
+        distances = cls.state_cls.distances_from([variables], cls.constants[c], max_cost)
+        return distances if summarize is None else summarize(distances)
+
+
+def _run_jobs(state_cls: type[State[C, V]], jobs: Iterable[tuple[V, C]], task: Callable, workers: int | None) -> list:
+    # Jobs refer to the constants by index, so every distinct constants object is pickled once per worker.
+    constants: list[C] = []
+    indices: dict[int, int] = {}
+    numbered_jobs = []
+    for variables, c in jobs:
+        if id(c) not in indices:
+            indices[id(c)] = len(constants)
+            constants.append(c)
+        numbered_jobs.append((variables, indices[id(c)]))
+    workers = min(workers or os.cpu_count() or 1, len(numbered_jobs))
+    # Starting a pool only pays off for enough jobs.
+    if workers > 1 and len(numbered_jobs) >= POOL_MIN_JOBS:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Daemon processes (like the parts of solve --all) aren't allowed to have children.
+        if not multiprocessing.current_process().daemon:
+            with ProcessPoolExecutor(workers, initializer=_Worker.setup, initargs=(state_cls, constants)) as pool:
+                return list(pool.map(task, numbered_jobs, chunksize=max(1, len(numbered_jobs) // (workers * 4))))
+    _Worker.setup(state_cls, constants)
+    return list(map(task, numbered_jobs))
+
+
+def path_lengths(state_cls: type[State[C, V]], jobs: Iterable[tuple[V, C]], workers: int | None = None) -> list[int]:
+    """
+    Lengths of the shortest paths of independent searches (variables of the initial state, and constants),
+    in a pool of processes (by default one per core) when there are enough of them. The state class has to be
+    importable by the workers.
+    """
+    return _run_jobs(state_cls, jobs, _Worker.length, workers)
+
+
+@overload
+def distance_maps(
+    state_cls: type[State[C, V]],
+    jobs: Iterable[tuple[V, C]],
+    max_cost: int | None = None,
+    summarize: None = None,
+    workers: int | None = None,
+) -> list[dict[Hashable, int]]: ...
+
+
+@overload
+def distance_maps(
+    state_cls: type[State[C, V]],
+    jobs: Iterable[tuple[V, C]],
+    max_cost: int | None = None,
+    *,
+    summarize: Callable[[dict[Hashable, int]], R],
+    workers: int | None = None,
+) -> list[R]: ...
+
+
+def distance_maps(
+    state_cls: type[State[C, V]],
+    jobs: Iterable[tuple[V, C]],
+    max_cost: int | None = None,
+    summarize: Callable[[dict[Hashable, int]], R] | None = None,
+    workers: int | None = None,
+) -> list[R] | list[dict[Hashable, int]]:
+    """
+    Distances of independent searches from the states with these variables (like State.distances_from()),
+    in a pool of processes. Big maps are expensive to send back: a (picklable) summarize function
+    turns them into what is needed while still in the worker.
+    """
+    return _run_jobs(state_cls, jobs, partial(_Worker.distances, max_cost=max_cost, summarize=summarize), workers)
+
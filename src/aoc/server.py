@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import tempfile
+from importlib import import_module
+from pathlib import Path
+from shutil import get_terminal_size
+from socketserver import ForkingMixIn, StreamRequestHandler, UnixStreamServer
+
+# Imported once by the server, so the forked children don't have to.
+PRELOAD = ("aoc.cli", "aoc.problems", "aoc.search", "aoc.geo2d", "aoc.geo3d", "aoc.utils", "parse")
+
+# Separates the output of a request from its exit code (solutions never print NUL characters).
+EXIT_MARKER = b"\0"
+# Sent instead of an exit code when the server has older code loaded than the client has on disk.
+STALE = b"stale"
+
+# The aoc package the server or client runs from
+PACKAGE = Path(__file__).parent
+
+
+def source_stamps(package: Path = PACKAGE) -> dict[str, list[int]]:
+    """
+    Modification time and size of the source files of the package (by relative path), which is what Python checks
+    before using its compiled bytecode. Way cheaper than hashing the sources on every request.
+    """
+    return {
+        path.relative_to(package).as_posix(): [(stat := path.stat()).st_mtime_ns, stat.st_size]
+        for path in package.rglob("*.py")
+    }
+
+
+def _loaded_stamps() -> dict[str, list[int]]:
+    """Stamps of the source files of the aoc modules that are loaded (and would be used by forked children)."""
+    files = {
+        Path(file).relative_to(PACKAGE).as_posix()
+        for name, module in sys.modules.items()
+        if name.split(".")[0] == "aoc" and (file := getattr(module, "__file__", None))
+    }
+    return {file: stamp for file, stamp in source_stamps().items() if file in files}
+
+
+def socket_path() -> Path:
+    return Path(tempfile.gettempdir()) / f"aoc-solve-{os.getuid()}.sock"
+
+
+class SolveHandler(StreamRequestHandler):
+    """
+    Runs in a forked child of the server: solves a request as if `solve` was run from the command line
+    in the client's working directory, with all output going back to the client.
+    """
+
+    server: "SolveServer"
+
+    def handle(self) -> None:
+        from aoc.cli import main
+
+        request = json.loads(self.rfile.readline())
+        if reason := self.server.stale(request):
+            self.wfile.write(
+                f"The solve server {reason}, solving locally (restart the server to use it again)\n".encode()
+                + EXIT_MARKER + STALE,
+            )
+            return
+        os.chdir(request["cwd"])
+        os.environ.update(COLUMNS=str(request["columns"]), LINES=str(request["lines"]))
+        for fd in (sys.stdout.fileno(), sys.stderr.fileno()):
+            os.dup2(self.connection.fileno(), fd)
+        # The handler of the server would log to the client as well, main() will add its own.
+        logging.getLogger().handlers.clear()
+        code = 0
+        try:
+            main(request["argv"])
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+        except Exception:
+            logging.exception("Unexpected error while solving")
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        self.wfile.write(EXIT_MARKER + str(code).encode())
+
+
+class SolveServer(ForkingMixIn, UnixStreamServer):
+    # Where the loaded modules came from, and the stamps of their source files when they were loaded
+    package = str(PACKAGE)
+    stamps: dict[str, list[int]]
+
+    def stale(self, request: dict) -> str | None:
+        """Why the loaded code isn't what the client would run: another checkout, or edited source files."""
+        if request.get("package") != self.package:
+            return f"runs the code in {self.package}"
+        sources = request.get("sources", {})
+        if edited := sorted(file for file, stamp in self.stamps.items() if sources.get(file) != stamp):
+            return f"has older code of {', '.join(edited)} loaded"
+        return None
+
+
+def is_running(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+        return True
+
+
+def serve(path: Path, modules: list[str]) -> bool:
+    """Preload modules and solve requests of clients on a Unix socket, until interrupted."""
+    if path.exists():
+        if is_running(path):
+            logging.error("A server is already listening on %s", path)
+            return False
+        path.unlink()
+    loaded = 0
+    for module in [*PRELOAD, *modules]:
+        try:
+            import_module(module)
+            loaded += 1
+        except Exception as exc:  # noqa: BLE001
+            logging.warning("Could not preload %s: %s", module, exc)
+    # Clean up the socket when being killed as well.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with SolveServer(str(path), SolveHandler) as server:
+        server.stamps = _loaded_stamps()
+        logging.info("Serving on %s with %d modules preloaded (Ctrl-C to stop)", path, loaded)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            path.unlink(missing_ok=True)
+    return True
+
+
+def request(argv: list[str], path: Path) -> int | None:
+    """
+    Let a running server handle the command line arguments and relay its output.
+    Returns the exit code, or None when no server is running or it runs older code than what is on disk.
+    """
+    with socket.socket(socket.AF_UNIX) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return None
+        columns, lines = get_terminal_size()
+        sock.sendall(json.dumps({
+            "argv": argv, "cwd": str(Path.cwd()), "columns": columns, "lines": lines,
+            "package": str(PACKAGE), "sources": source_stamps(),
+        }).encode() + b"\n")
+        out = sys.stderr.buffer
+        code: bytes | None = None
+        while chunk := sock.recv(1 << 16):
+            if code is not None:
+                code += chunk
+                continue
+            output, marker, rest = chunk.partition(EXIT_MARKER)
+            out.write(output)
+            out.flush()
+            if marker:
+                code = rest
+    if code == STALE:
+        return None
+    # No exit code means the child died halfway.
+    return int(code) if code else 1
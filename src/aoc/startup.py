@@ -0,0 +1,89 @@
+import logging
+import re
+import subprocess
+import sys
+from collections.abc import Iterable
+from time import perf_counter_ns
+from typing import NamedTuple
+
+from aoc.utils import human_readable_duration, log_table
+
+IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".")[0]
+
+
+class StartupReport(NamedTuple):
+    interpreter: int
+    total: int
+    imports: list[ImportTime]
+
+    @property
+    def import_time(self) -> int:
+        return sum(i.cumulative_us for i in self.imports if i.depth == 0) * 1_000
+
+    def packages(self) -> dict[str, int]:
+        """Total import time (self times, in nanoseconds) of every top level package."""
+        totals: dict[str, int] = {}
+        for i in self.imports:
+            totals[i.package] = totals.get(i.package, 0) + i.self_us * 1_000
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def _run_python(code: str) -> tuple[int, str]:
+    start = perf_counter_ns()
+    process = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return perf_counter_ns() - start, process.stderr
+
+
+def parse_import_times(output: str) -> list[ImportTime]:
+    return [
+        ImportTime(module, len(indent) // 2, int(self_us), int(cumulative_us))
+        for self_us, cumulative_us, indent, module in IMPORT_TIME.findall(output)
+    ]
+
+
+def measure(modules: Iterable[str]) -> StartupReport:
+    """Measure how long a fresh interpreter takes to start, and to import the given modules."""
+    interpreter, output = _run_python("pass")
+    # Leave out whatever the interpreter imports by itself (encodings, site, ...)
+    startup_modules = {i.module for i in parse_import_times(output)}
+    total, output = _run_python("; ".join(f"import {module}" for module in modules))
+    return StartupReport(interpreter, total, [
+        i for i in parse_import_times(output) if i.module not in startup_modules
+    ])
+
+
+def report(modules: list[str], top: int = 15, budget_ms: float | None = None) -> bool:
+    """Log a startup report for importing the given modules. Returns whether it fits within the budget."""
+    try:
+        startup = measure(modules)
+    except subprocess.CalledProcessError as exc:
+        logging.error("Could not import the modules: %s", exc.stderr.strip().splitlines()[-1])  # noqa: TRY400
+        return False
+    log_table([
+        ["Package", "Import time"],
+        *([package, human_readable_duration(ns)] for package, ns in list(startup.packages().items())[:top]),
+    ])
+    logging.info(" ")
+    logging.info(" Interpreter startup: %s", human_readable_duration(startup.interpreter))
+    logging.info(" Imports:             %s (%s)", human_readable_duration(startup.import_time), ", ".join(modules))
+    logging.info(" Total:               %s", human_readable_duration(startup.total))
+    if budget_ms is not None and startup.total > budget_ms * 1_000_000:
+        logging.error("Startup takes longer than the budget of %s ms", budget_ms)
+        return False
+    return True
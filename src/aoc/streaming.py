@@ -0,0 +1,73 @@
+import mmap
+from collections.abc import Iterator
+from functools import cached_property
+from pathlib import Path
+
+from more_itertools import lstrip, rstrip
+
+
+def content_bounds(data: bytes | mmap.mmap | memoryview) -> tuple[int, int]:
+    """
+    Where the content of raw input starts and ends: after the newlines at the start and before the whitespace at the
+    end, which is what Problem.corrected_input leaves of it.
+    """
+    start, end = 0, len(data)
+    while start < end and data[start:start + 1] == b"\n":
+        start += 1
+    while end > start and bytes(data[end - 1:end]).isspace():
+        end -= 1
+    return start, end
+
+
+class InputFile:
+    """
+    Memory mapped input file, for inputs too big to comfortably keep a few copies of in memory.
+    The operating system pages the file in (and out) as needed, nothing is copied until it is asked for.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as f:
+            # Empty files can't be mapped.
+            self._data: mmap.mmap | bytes = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if (
+                path.stat().st_size
+            ) else b""
+
+    @property
+    def view(self) -> memoryview:
+        """Zero-copy view on the raw bytes of the file."""
+        return memoryview(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def raw_lines(self) -> Iterator[str]:
+        """Decode the lines one by one, starting after the newlines at the start."""
+        data, end = self._data, len(self._data)
+        start, _ = content_bounds(data)
+        while start < end:
+            newline = data.find(b"\n", start)
+            if newline < 0:
+                newline = end
+            yield data[start:newline].decode().removesuffix("\r")
+            start = newline + 1
+
+    def lines(self) -> Iterator[str]:
+        """Decode the lines one by one, leaving out empty lines at the start and blank ones at the end (like Problem)."""
+        return rstrip(lstrip(self.raw_lines(), lambda line: line == ""), lambda line: not line.strip())
+
+    @cached_property
+    def line_count(self) -> int:
+        """Number of lines, again without the empty ones at the start and the end (and without decoding)."""
+        data = self._data
+        start, end = content_bounds(data)
+        if start == end:
+            return 0
+        count = 1
+        while (newline := data.find(b"\n", start, end)) >= 0:
+            count += 1
+            start = newline + 1
+        return count
+
+    def text(self) -> str:
+        return bytes(self._data).decode()
@@ -50,6 +50,25 @@ def human_readable_duration(nanoseconds: int) -> str:
     return f"{microseconds:d}.{nanoseconds:03d} µs"
 
 
+def human_readable_size(num_bytes: int) -> str:
+    """
+    >>> human_readable_size(512)
+    '512 B'
+    >>> human_readable_size(1536)
+    '1.500 KiB'
+    >>> human_readable_size(3 * 1024 ** 3)
+    '3.000 GiB'
+    """
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    size = float(num_bytes)
+    for unit in ("KiB", "MiB", "GiB"):
+        size /= 1024
+        if size < 1024 or unit == "GiB":
+            break
+    return f"{size:.3f} {unit}"
+
+
 @runtime_checkable
 class Sortable(Protocol):
     def __lt__(self, other: object) -> bool: ...
@@ -95,19 +114,23 @@ def pixel(
 #         logging.debug(''.join(pixel(v, on, off, special, pixels) for v in row))
 
 
-def debug_table(table: Iterable[Iterable[object]], widths: Iterable[int] | None = None) -> None:
-    if not AOC.debugging:
-        return
+def log_table(table: Iterable[Iterable[object]], widths: Iterable[int] | None = None, level: int = logging.INFO) -> None:
     rows = [[(v if isinstance(v, tuple) else (str(v), len(str(v)))) for v in row] for row in table]
     widths_ = [max(length for _, length in col) for col in zip(*rows, strict=False)]
     for i, w in enumerate(widths or []):
         widths_[i] = w
     for i, row in enumerate(rows):
-        logging.debug(" %s", "   ".join(
+        logging.log(level, " %s", "   ".join(
             (chalk.underline(s) if i == 0 else s) + " " * (w - length) for (s, length), w in zip(row, widths_, strict=False)
         ))
 
 
+def debug_table(table: Iterable[Iterable[object]], widths: Iterable[int] | None = None) -> None:
+    if not AOC.debugging:
+        return
+    log_table(table, widths, logging.DEBUG)
+
+
 def compose_number(numbers: Iterable[int]) -> int:
     return int("".join(str(n) for n in numbers))
 
@@ -133,6 +156,42 @@ def int_to_bits(i: int, min_length: int = 0) -> list[bool]:
     return [c == "1" for c in s]
 
 
+def pack_ints(values: Iterable[int], bits: int) -> int:
+    """
+    Pack small non-negative ints (each less than 2 ** bits) into one int, e.g. as a compact key of a search state.
+
+    >>> pack_ints([1, 0, 3, 2], bits=2)
+    78
+    >>> pack_ints([], bits=2)
+    0
+    """
+    packed = 0
+    for v in values:
+        packed = packed << bits | v
+    return packed
+
+
+def unpack_ints(packed: int, bits: int, length: int) -> list[int]:
+    """
+    >>> unpack_ints(78, bits=2, length=4)
+    [1, 0, 3, 2]
+    >>> unpack_ints(pack_ints([0, 0, 5], bits=3), bits=3, length=3)
+    [0, 0, 5]
+    """
+    mask = (1 << bits) - 1
+    return [packed >> (bits * i) & mask for i in reversed(range(length))]
+
+
+def pack_bytes(*parts: Iterable[int]) -> bytes:
+    """
+    Pack ints from 0 to 255 (of one or more sequences) into bytes: quicker to build than pack_ints() for longer keys.
+
+    >>> pack_bytes([1, 0, 3], (2, 4))
+    b'\\x01\\x00\\x03\\x02\\x04'
+    """
+    return bytes(chain.from_iterable(parts))
+
+
 def mods(x: int, y: int, shift: int = 0) -> int:
     return (x - shift) % y + shift
 
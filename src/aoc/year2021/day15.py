@@ -4,7 +4,7 @@ from typing import NamedTuple
 
 from aoc.geo2d import P2, Grid2
 from aoc.problems import NumberGridProblem
-from aoc.search import DijkstraState
+from aoc.search import DialState, PathMode
 from aoc.utils import mods
 
 
@@ -18,7 +18,10 @@ class Variables(NamedTuple):
     position: P2 = 0, 0
 
 
-class ChitonState(DijkstraState[Constants, Variables]):
+class ChitonState(DialState[Constants, Variables]):
+    max_weight = 9
+    path_mode = PathMode.NONE
+
     @property
     def is_finished(self) -> bool:
         return self.v.position == self.c.end_position
@@ -30,8 +33,16 @@ class ChitonState(DijkstraState[Constants, Variables]):
             for pos, dist in self.c.cave.neighbors(self.v.position)
         ]
 
+    @property
+    def reverse_states(self) -> list[ChitonState]:
+        # Coming from a neighbor costs the risk level of this position.
+        risk = self.c.cave[self.v.position]
+        return [self.move(distance=risk, position=pos) for pos, _ in self.c.cave.neighbors(self.v.position)]
+
 
 class Problem1(NumberGridProblem[int]):
+    supports_streaming = True
+
     test_solution = 40
     my_solution = 583
 
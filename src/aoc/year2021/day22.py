@@ -28,6 +28,8 @@ def __parse_state(s: str) -> int:
 
 
 class _Problem(ParsedProblem[tuple[int, int, int, int, int, int, int], int], ABC):
+    supports_streaming = True
+
     line_pattern = "{:state} x={:d}..{:d},y={:d}..{:d},z={:d}..{:d}"
 
     def __init__(self):
@@ -8,8 +8,10 @@ from typing import NamedTuple
 
 from yachalk import chalk
 
+from aoc import AOC
 from aoc.problems import MultiLineProblem
-from aoc.search import DijkstraState
+from aoc.search import DijkstraState, PathMode
+from aoc.utils import pack_bytes
 
 
 @dataclass
@@ -50,6 +52,10 @@ class Room:
     def spots_left(self) -> int:
         return self._size - len(self._content)
 
+    @property
+    def spots(self) -> list[int]:
+        return self._content + [0] * self.spots_left
+
     def can_add(self, amphipod: int) -> bool:
         return amphipod == self._amphipod_type and not self.is_full and self.is_clean
 
@@ -70,8 +76,12 @@ class Variables(NamedTuple):
 
 
 class AmphipodState(DijkstraState[Constants, Variables]):
-    def __hash__(self) -> int:
-        return hash(f"{self.v.rooms}{self.v.hallway}")
+    # The path is only shown when debugging (see _TracedAmphipodState).
+    path_mode = PathMode.NONE
+
+    def key(self) -> bytes:
+        # Every spot in the rooms (0 if it's empty) and the hallway
+        return pack_bytes(*(room.spots for room in self.v.rooms), self.v.hallway)
 
     @property
     def is_finished(self) -> bool:
@@ -140,11 +150,15 @@ class AmphipodState(DijkstraState[Constants, Variables]):
         )
 
 
+class _TracedAmphipodState(AmphipodState):
+    path_mode = PathMode.PARENTS
+
+
 class _Problem(MultiLineProblem[int], ABC):
     def shortest_path(self, is_part_1: bool) -> int:
         lines = self.lines[5:1:-3] if is_part_1 else self.lines[5:1:-1]
         room_size = len(lines)
-        path = AmphipodState.find_path(
+        path = (_TracedAmphipodState if AOC.debugging else AmphipodState).find_path(
             Variables(rooms=[
                 Room(name, room_size, [{"A": 1, "B": 2, "C": 3, "D": 4}[c] for c in content])
                 for name, content in enumerate(zip(*[line[3:10:2] for line in lines], strict=False), 1)
@@ -152,12 +166,13 @@ class _Problem(MultiLineProblem[int], ABC):
             Constants(room_size),
         )
 
-        for i, state in enumerate(path.states):
-            if i:
-                logging.debug("Step %d, cost so far: %d", i, state.cost)
+        if AOC.debugging:
+            for i, state in enumerate(path.states):
+                if i:
+                    logging.debug("Step %d, cost so far: %d", i, state.cost)
+                    logging.debug(" ")
+                logging.debug(state)
                 logging.debug(" ")
-            logging.debug(state)
-            logging.debug(" ")
 
         return path.length
 
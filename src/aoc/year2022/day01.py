@@ -4,14 +4,18 @@ from operator import not_
 from more_itertools import split_at
 
 from aoc.problems import MultiLineProblem
-from aoc.utils import try_convert
 
 
 class _Problem(MultiLineProblem[int], ABC):
-    def __init__(self):
-        self.calorie_totals = [sum(
-            try_convert(int, c) for c in elf_calories
-        ) for elf_calories in split_at(self.lines, not_)]
+    # Only the totals are kept, so the lines don't need to be in memory all at once.
+    supports_streaming = True
+
+    calorie_totals: list[int]
+
+    def process_input(self) -> None:
+        self.calorie_totals = [
+            sum(map(int, elf_calories)) for elf_calories in split_at(self.input_lines(), not_)
+        ]
 
 
 class Problem1(_Problem):
@@ -3,25 +3,26 @@ from __future__ import annotations
 import logging
 from abc import ABC
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Generic, NamedTuple, TypeVar
+from typing import TYPE_CHECKING, Generic, NamedTuple, TypeVar, cast
 
 from yachalk import chalk
 
 from aoc import AOC
-from aoc.geo2d import P2, Grid2
 from aoc.problems import NumberGridProblem
-from aoc.search import AStarState, BFSState, DijkstraState, State
+from aoc.search import AStarState, BFSState, DijkstraState, PackedSearch, State
 from aoc.utils import debug_table, timed
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    from aoc.geo2d import P2, Grid2
+    from aoc.search import ShortestPath
+
 
 @dataclass
 class Constants:
     hill: Grid2[int]
     goal: int
-    reverse: bool
 
 
 class Variables(NamedTuple):
@@ -44,11 +45,14 @@ class _State(State[C, V], ABC, Generic[C, V]):
     def next_states(self) -> Iterator[_State]:
         height = self.c.hill[self.v.pos]
         for new_pos, new_height in self.c.hill.neighbors(self.v.pos):
-            if ((
-                height <= new_height + 1
-            ) if self.c.reverse else (
-                new_height <= height + 1
-            )):
+            if new_height <= height + 1:
+                yield self.move(pos=new_pos)
+
+    @property
+    def reverse_states(self) -> Iterator[_State]:
+        height = self.c.hill[self.v.pos]
+        for new_pos, new_height in self.c.hill.neighbors(self.v.pos):
+            if height <= new_height + 1:
                 yield self.move(pos=new_pos)
 
 
@@ -75,54 +79,79 @@ class _AStarState(_State[AStarConstants, Variables], AStarState[AStarConstants,
         return horizontal_distance + vertical_distance
 
 
+def _visited_points(path: ShortestPath) -> set[P2]:
+    # The keys of the visited states are their variables.
+    return {cast("Variables", v).pos for v in path.visited}
+
+
 PRE_A = ord("a") - 1
+END = 27
 
 
 class _Problem(NumberGridProblem[int], ABC):
+    supports_streaming = True
+
     def convert_element(self, element: str) -> int:
-        return {"S": 0, "E": 27}.get(element, ord(element) - PRE_A)
-
-    def shortest_path(self, start: str, end: str) -> int:
-        start_val, end_val = self.convert_element(start), self.convert_element(end)
-        reverse = end_val < start_val
-        start_pos = self.grid.point_with_value(start_val)
-        ep = self.grid.points_with_value(end_val)
-        end_pos = ep.pop() if len(ep) == 1 else None
-
-        c = Constants(self.grid, end_val, reverse=end_val < start_val)
-        p_bfs, _, t_bfs = timed(lambda: _BFSState.find_path(Variables(pos=start_pos), c))
-        visited_points_bfs: set[P2] = {s.v.pos for s in p_bfs.visited}
-        p_dijkstra, _, t_dijkstra = timed(lambda: _DijkstraState.find_path(Variables(pos=start_pos), c))
-        visited_points_dijkstra: set[P2] = {s.v.pos for s in p_dijkstra.visited}
-        if end_pos:
-            ac = AStarConstants(self.grid, end_val, reverse, end_pos)
-            p_a_star, _, t_a_star = timed(lambda: _AStarState.find_path(Variables(pos=start_pos), ac))
-            visited_points_a_star: set[P2] = {s.v.pos for s in p_a_star.visited}
-            a_star_result = [((f'{chalk.hex("034").bg_hex("bdf")("E")} end', 5), "A*", len(p_a_star.visited), t_a_star)]
-        else:
-            visited_points_a_star = set[P2]()
-            a_star_result = []
+        return {"S": 0, "E": END}.get(element, ord(element) - PRE_A)
 
+    def shortest_path(self, start: str) -> int:
+        """Shortest climb to E from any of the cells with the start elevation (all of them at once)."""
+        starts = self.grid.points_with_value(self.convert_element(start))
+        end_pos = self.grid.point_with_value(END)
         if AOC.debugging:
-            p_points: set[P2] = {s.v.pos for s in p_bfs.states}
-            hill_chars = {p: {0: "S", 27: "E"}.get(h, chr(h + PRE_A)) for p, h in self.grid.items()}
-            logging.debug(self.grid.to_str(lambda p, _: (
-                chalk.hex("034").bg_hex("bdf")(hill_chars[p]) if (
-                    p in {start_pos, end_pos} | ep
-                ) else chalk.hex("068").bg_hex("0af")(hill_chars[p]) if (
-                    p in p_points
-                ) else chalk.hex("535").bg_hex("848")(hill_chars[p]) if (
-                    p in visited_points_a_star
-                ) else chalk.hex("424").bg_hex("636")(hill_chars[p]) if (
-                    p in visited_points_dijkstra
-                ) else chalk.hex("212").bg_hex("424")(hill_chars[p]) if (
-                    p in visited_points_bfs
-                ) else chalk.hex("222").bg_hex("333")(hill_chars[p]) if (
-                    hill_chars[p] == end_val
-                ) else chalk.hex("222").bg_hex("000")(hill_chars[p])
-            )))
-            logging.debug(" ")
-            debug_table([("Legend", "Algorithm", "Visited", "Path found in"), ("", "BFS", len(p_bfs.visited), t_bfs), ((f"{chalk.hex('034').bg_hex('bdf')('S')} start", 7), "Dijkstra", len(p_dijkstra.visited), t_dijkstra), *a_star_result, ((f"{chalk.hex('068').bg_hex('0af')('p')} path", 6), "", "", "", ""), ((f"{chalk.hex('535').bg_hex('848')('x')} visited by all algorithms (A*, Dijkstra & BFS)", 48), "", "", "", ""), ((f"{chalk.hex('424').bg_hex('636')('y')} only visited by Dijkstra & BFS", 32), "", "", "", ""), ((f"{chalk.hex('212').bg_hex('424')('z')} only visited by BFS", 21), "", "", "", ""), ((f"{chalk.hex('222').bg_hex('333')('a')} possible starting points (including un-escapable)", 51 + 68), "", "", "", ""), ((f"{chalk.hex('222').bg_hex('000')('w')} wild, unexplored terrain", 26), "", "", "", "")])
+            return self.compare_engines(starts, end_pos)
+        return self.packed_shortest_path(starts, end_pos)
+
+    def packed_shortest_path(self, starts: set[P2], end_pos: P2) -> int:
+        """Same as the BFS of _BFSState (which finds the answers), over positions packed into y * width + x."""
+        width, height = self.grid.size
+        heights = [self.grid[x, y] for y in range(height) for x in range(width)]
+        size = len(heights)
+
+        def expand(n: int) -> Iterator[tuple[int, int]]:
+            h, x = heights[n], n % width
+            for m in (n - width, n + width, n - 1 if x > 0 else -1, n + 1 if x < width - 1 else -1):
+                if 0 <= m < size and heights[m] <= h + 1:
+                    yield m, 1
+
+        ex, ey = end_pos
+        end = ey * width + ex
+        return PackedSearch(size, expand, max_weight=1).find([y * width + x for x, y in starts], end.__eq__).length
+
+    def compare_engines(self, starts: set[P2], end_pos: P2) -> int:
+        """Find the path with BFS, Dijkstra and A*, and show what each of them visited."""
+        c = Constants(self.grid, END)
+        sources = [Variables(pos=p) for p in starts]
+
+        p_bfs, _, t_bfs = timed(lambda: _BFSState.find_path(None, c, sources=sources))
+        visited_points_bfs: set[P2] = _visited_points(p_bfs)
+        p_dijkstra, _, t_dijkstra = timed(lambda: _DijkstraState.find_path(None, c, sources=sources))
+        visited_points_dijkstra: set[P2] = _visited_points(p_dijkstra)
+        ac = AStarConstants(self.grid, END, end_pos)
+        p_a_star, _, t_a_star = timed(lambda: _AStarState.find_path(None, ac, sources=sources))
+        visited_points_a_star: set[P2] = _visited_points(p_a_star)
+        a_star_result = [((f'{chalk.hex("034").bg_hex("bdf")("E")} end', 5), "A*", len(p_a_star.visited), t_a_star)]
+        p_bi, _, t_bi = timed(lambda: _BFSState.find_path_between(sources, Variables(pos=end_pos), c))
+
+        p_points: set[P2] = {s.v.pos for s in p_bfs.states}
+        hill_chars = {p: {0: "S", END: "E"}.get(h, chr(h + PRE_A)) for p, h in self.grid.items()}
+        logging.debug(self.grid.to_str(lambda p, _: (
+            chalk.hex("034").bg_hex("bdf")(hill_chars[p]) if (
+                p in {p_bfs.states[0].v.pos, end_pos}
+            ) else chalk.hex("068").bg_hex("0af")(hill_chars[p]) if (
+                p in p_points
+            ) else chalk.hex("535").bg_hex("848")(hill_chars[p]) if (
+                p in visited_points_a_star
+            ) else chalk.hex("424").bg_hex("636")(hill_chars[p]) if (
+                p in visited_points_dijkstra
+            ) else chalk.hex("212").bg_hex("424")(hill_chars[p]) if (
+                p in visited_points_bfs
+            ) else chalk.hex("222").bg_hex("333")(hill_chars[p]) if (
+                p in starts
+            ) else chalk.hex("222").bg_hex("000")(hill_chars[p])
+        )))
+        logging.debug(" ")
+        debug_table([("Legend", "Algorithm", "Visited", "Path found in"), ("", "BFS", len(p_bfs.visited), t_bfs), ((f"{chalk.hex('034').bg_hex('bdf')('S')} start", 7), "Dijkstra", len(p_dijkstra.visited), t_dijkstra), *a_star_result, ((f"{chalk.hex('068').bg_hex('0af')('p')} path", 6), "Bidirectional BFS", len(p_bi.visited), t_bi), ((f"{chalk.hex('535').bg_hex('848')('x')} visited by all algorithms (A*, Dijkstra & BFS)", 48), "", "", "", ""), ((f"{chalk.hex('424').bg_hex('636')('y')} only visited by Dijkstra & BFS", 32), "", "", "", ""), ((f"{chalk.hex('212').bg_hex('424')('z')} only visited by BFS", 21), "", "", "", ""), ((f"{chalk.hex('222').bg_hex('333')('a')} possible starting points (including un-escapable)", 51 + 68), "", "", "", ""), ((f"{chalk.hex('222').bg_hex('000')('w')} wild, unexplored terrain", 26), "", "", "", "")])
         return p_bfs.length
 
 
@@ -131,7 +160,7 @@ class Problem1(_Problem):
     my_solution = 490
 
     def solution(self) -> int:
-        return self.shortest_path(start="E", end="S")
+        return self.shortest_path(start="S")
 
 
 class Problem2(_Problem):
@@ -139,7 +168,7 @@ class Problem2(_Problem):
     my_solution = 488
 
     def solution(self) -> int:
-        return self.shortest_path(start="E", end="a")
+        return self.shortest_path(start="a")
 
 
 TEST_INPUT = """
@@ -32,6 +32,8 @@ def merge(cov: Iterable[P2]) -> list[P2]:
 
 
 class _Problem(ParsedProblem[tuple[int, int, int, int], int], ABC):
+    supports_streaming = True
+
     line_pattern = "Sensor at x={:d}, y={:d}: closest beacon is at x={:d}, y={:d}"
 
     def __init__(self) -> None:
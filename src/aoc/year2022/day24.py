@@ -11,7 +11,7 @@ from yachalk import chalk
 from aoc import AOC
 from aoc.geo2d import P2, Dir2, manhattan_dist_2
 from aoc.problems import GridProblem
-from aoc.search import AStarState
+from aoc.search import AStarState, DialState
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
@@ -38,7 +38,10 @@ class Variables(NamedTuple):
     cycle: int = 1
 
 
-class ValleyState(AStarState[Constants, Variables]):
+class ValleyState(AStarState[Constants, Variables], DialState[Constants, Variables]):
+    # Every step costs 1, and the heuristic changes by at most 1.
+    max_weight = 2
+
     @property
     def is_finished(self) -> bool:
         return self.v.pos == self.c.end
@@ -61,6 +64,10 @@ class ValleyState(AStarState[Constants, Variables]):
     def heuristic(self) -> int:
         return manhattan_dist_2(self.v.pos, self.c.end)
 
+    def restarted(self) -> ValleyState:
+        """The same state, scored for the current end (after the direction has been reversed)."""
+        return ValleyState(self.v, self.prev, self.cost)
+
     def __repr__(self):
         return f"{self.v.pos} - {self.v.cycle}"
 
@@ -102,9 +109,9 @@ class Problem2(_Problem):
     def solution(self) -> int:
         first = self.path.end_state
         self.constants.reverse_direction()
-        second = first.find_path_from_current_state().end_state
+        second = first.restarted().find_path_from_current_state().end_state
         self.constants.reverse_direction()
-        return second.find_path_from_current_state().length
+        return second.restarted().find_path_from_current_state().length
 
 
 TEST_INPUT = """
@@ -9,7 +9,7 @@ from aoc.problems import NumberGridProblem
 
 class _Problem(NumberGridProblem[int], ABC):
     def __init__(self) -> None:
-        logging.debug(self.grid.to_str(lambda _, v: (
+        logging.debug(lambda: self.grid.to_str(lambda _, v: (
             chalk.hex("332").bg_hex("111")(".") if (
                 v == 10 or v is None
             ) else chalk.hex("111").bg_hex("0af")(chr(v)) if (
@@ -4,7 +4,7 @@ from typing import NamedTuple, Self
 
 from aoc.geo2d import P2, Dir2, Grid2, Range
 from aoc.problems import NumberGridProblem
-from aoc.search import DijkstraState
+from aoc.search import DialState, PathMode
 
 
 class Constants:
@@ -12,6 +12,8 @@ class Constants:
         self.map = map_
         self.min_segment, self.max_segment = segment_range
         self.end = map_.width - 1, map_.height - 1
+        # Bits per coordinate and segment length in the packed keys of the states
+        self.key_bits = max(map_.width, map_.height, self.max_segment + 1).bit_length()
 
 
 class Variables(NamedTuple):
@@ -28,8 +30,19 @@ DIRS: dict[P2 | None, list[P2]] = {
     None: Dir2.direct_neighbors,
 }
 
+DIR_NUMBERS = {d: i for i, d in enumerate(DIRS)}
+
+
+class LavaState(DialState[Constants, Variables]):
+    max_weight = 9
+    path_mode = PathMode.NONE
+
+    def key(self) -> int:
+        # Packed like aoc.utils.pack_ints() does, with 3 bits for the direction number (unrolled: this is hot)
+        (x, y), from_dir, seg_length = self.v
+        b = self.c.key_bits
+        return ((x << b | y) << 3 | DIR_NUMBERS[from_dir]) << b | seg_length
 
-class LavaState(DijkstraState[Constants, Variables]):
     @property
     def is_finished(self) -> bool:
         return self.v.pos == self.c.end and not 0 < self.v.seg_length < self.c.min_segment
@@ -52,6 +65,8 @@ class LavaState(DijkstraState[Constants, Variables]):
 
 
 class _Problem(NumberGridProblem[int], ABC):
+    supports_streaming = True
+
     segment_range: Range
 
     def solution(self) -> int:
@@ -8,30 +8,31 @@ from more_itertools import last
 from aoc import AOC
 from aoc.geo2d import P2, Grid2
 from aoc.problems import FatalError, GridProblem, InputMode, var
-from aoc.search import BFSState
+from aoc.search import BFSState, PathMode
 from aoc.utils import repeat_transform
 
 
 class Constants(NamedTuple):
     grid: Grid2[str]
-    steps: int
 
 
 class Variables(NamedTuple):
     pos: P2
-    count_me: bool
 
 
 class GardenState(BFSState[Constants, Variables]):
+    path_mode = PathMode.NONE
+
     @property
     def is_finished(self) -> bool:
-        return self.cost > self.c.steps
+        # Only used to get the distances to all plots (within a number of steps).
+        return False
 
     @property
     def next_states(self: Self) -> Iterable[Self]:
         for p, v in self.c.grid.neighbors(self.v.pos):
             if v != "#":
-                yield self.move(pos=p, count_me=not self.v.count_me)
+                yield self.move(pos=p)
 
 
 class _Problem(GridProblem[int], ABC):
@@ -43,9 +44,13 @@ class _Problem(GridProblem[int], ABC):
             return {n for p in points for n, v in self.grid.neighbors(p) if v != "#"}
         return len(last(repeat_transform({self.start}, step, times=steps)))
 
-    def num_garden_plots(self, steps: int) -> int:
-        path = GardenState.find_path(Variables(self.start, steps % 2 == 0), Constants(self.grid, steps))
-        return sum(s.v.count_me for s in path.visited)
+    def garden_plots(self, steps: list[int]) -> list[int]:
+        """
+        Number of plots that can be reached in exactly each number of steps, all from one search:
+        the plots within that many steps, at a distance with the same parity (the rest is going back and forth).
+        """
+        distances = GardenState.distances_from([Variables(self.start)], Constants(self.grid), max(steps)).values()
+        return [sum(d <= s and d % 2 == s % 2 for d in distances) for s in steps]
 
 
 class Problem1(_Problem):
@@ -53,7 +58,8 @@ class Problem1(_Problem):
     my_solution = 3591
 
     def solution(self) -> int:
-        return self.num_garden_plots(var(test=6, puzzle=64))
+        [plots] = self.garden_plots([var(test=6, puzzle=64)])
+        return plots
 
 
 class Problem2(_Problem):
@@ -65,7 +71,7 @@ class Problem2(_Problem):
             msg = "This approach only works for the puzzle data!"
             raise FatalError(msg)
         size, (center, _) = self.grid.width, self.start
-        c, u1, u2 = (self.num_garden_plots(center + size * i) for i in range(3))
+        c, u1, u2 = self.garden_plots([center + size * i for i in range(3)])
         b = (u1 * 4 - u2 - c * 3) / 2
         a = u1 - b - c
         n = (steps - center) / size
@@ -74,8 +80,8 @@ class Problem2(_Problem):
     def solution(self) -> int:
         self.grid.infinite = True
         if AOC.input_mode == InputMode.TEST:
-            for i, s in [(6, 16), (10, 50), (50, 1594), (100, 6536), (500, 167004), (1000, 668697)]:  # (5000, 16733044)
-                ans = self.num_garden_plots(i)
+            checks = [(6, 16), (10, 50), (50, 1594), (100, 6536), (500, 167004), (1000, 668697)]  # (5000, 16733044)
+            for (i, s), ans in zip(checks, self.garden_plots([i for i, _ in checks]), strict=True):
                 logging.info("Checking input %d: %s == %s -> %s", i, s, ans, "👌" if ans == s else "Nope")
             return 0
         return self.infinite_plots(26501365)
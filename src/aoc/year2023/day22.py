@@ -45,6 +45,8 @@ class Brick:
 
 
 class _Problem(ParsedProblem[tuple[P3D, P3D], int], ABC):
+    supports_streaming = True
+
     line_pattern = "{:p3}~{:p3}"
 
     def __init__(self) -> None:
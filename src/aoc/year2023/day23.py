@@ -1,18 +1,28 @@
+from __future__ import annotations
+
 from abc import ABC
-from collections.abc import Callable, Iterator
 from itertools import pairwise
-
-from igraph import EdgeSeq, Graph, Layout, plot  # type: ignore[import-untyped]
-from matplotlib import pyplot as plt
-from matplotlib.axes import Axes
+from typing import TYPE_CHECKING
 
 from aoc import AOC
 from aoc.geo2d import P2, Dir2, Grid2
+from aoc.lazy import lazy_import
 from aoc.problems import GridProblem
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    import igraph as ig  # type: ignore[import-untyped]
+    from matplotlib import pyplot as plt
+    from matplotlib.axes import Axes
+else:
+    # Only needed when actually solving (igraph) or debugging (matplotlib)
+    ig = lazy_import("igraph")
+    plt = lazy_import("matplotlib.pyplot")
+
 
-def longest_path(graph: Graph, weighted_edges: bool) -> tuple[EdgeSeq, int]:
-    def gen_paths() -> Iterator[tuple[EdgeSeq, int]]:
+def longest_path(graph: ig.Graph, weighted_edges: bool) -> tuple[ig.EdgeSeq, int]:
+    def gen_paths() -> Iterator[tuple[ig.EdgeSeq, int]]:
         start, end = graph.vs.select(_degree=1)
         for ids in graph.get_all_simple_paths(start, end):
             es = graph.es[graph.get_eids(pairwise(ids))]
@@ -45,18 +55,18 @@ class Problem1(_Problem):
     test_solution = 94
     my_solution = 2326
 
-    def plot_callback(self, ax, graph: Graph, lp_edges: EdgeSeq) -> None:
-        plot(
+    def plot_callback(self, ax, graph: ig.Graph, lp_edges: ig.EdgeSeq) -> None:
+        ig.plot(
             graph,
             target=ax,
             vertex_size=6,
             edge_color=["tomato" if e in lp_edges else "grey" for e in graph.es],
             edge_width=2,  # [2 if e in longest_es else .5 for e in graph.es],
-            layout=Layout(self.road.keys()),
+            layout=ig.Layout(self.road.keys()),
         )
 
     def solution(self) -> int:
-        graph = Graph(edges=[
+        graph = ig.Graph(edges=[
             e for i, j, bidirectional in self.graph_values
             for e in [(i, j)] + ([(j, i)] if bidirectional else [])
         ], directed=True)
@@ -70,17 +80,17 @@ class Problem2(_Problem):
     test_solution = 154
     my_solution = 6574
 
-    def plot_callback(self, ax, graph: Graph, lp_edges: EdgeSeq, g_weigths: Graph) -> None:
+    def plot_callback(self, ax, graph: ig.Graph, lp_edges: ig.EdgeSeq, g_weigths: ig.Graph) -> None:
         longest_es = [e for pe in lp_edges for e in graph.es.select(_within=pe["chain"])]
-        plot(
+        ig.plot(
             graph,
             target=ax,
             vertex_size=0,
             edge_color="tomato",  # ['tomato' if e in longest_es else 'grey' for e in graph.es],
             edge_width=[2 if e in longest_es else .5 for e in graph.es],
-            layout=Layout(self.ps),
+            layout=ig.Layout(self.ps),
         )
-        plot(
+        ig.plot(
             g_weigths,
             target=ax,
             vertex_size=0,
@@ -88,17 +98,17 @@ class Problem2(_Problem):
             edge_background=["#0af" if e in lp_edges else None for e in g_weigths.es],
             edge_color="#0af",  # ['#0af' if e in lp_edges else 'grey' for e in g_weigths.es],
             edge_width=[5 if e in lp_edges else 1 for e in g_weigths.es],
-            layout=Layout(g_weigths.vs["pos"]),
+            layout=ig.Layout(g_weigths.vs["pos"]),
         )
 
     def solution(self) -> int:
         ids = list(range(len(self.road)))
-        graph = Graph(edges=[(i, j) for i, j, _ in self.graph_values], vertex_attrs={"idx": ids})
+        graph = ig.Graph(edges=[(i, j) for i, j, _ in self.graph_values], vertex_attrs={"idx": ids})
         chain_ids = graph.vs.select(_degree=2)["idx"]
         g_chains = graph.subgraph_edges(graph.es.select(_within=chain_ids))
         w_ids = {o: n for n, o in enumerate(set(ids) - set(chain_ids))}
         chain_vs = [g_chains.vs[c] for c in g_chains.connected_components("weak")]
-        g_weigths = Graph(
+        g_weigths = ig.Graph(
             edges=[[
                 w_ids[i]
                 for v in graph.vs.select(vs.select(_degree=1)["idx"])
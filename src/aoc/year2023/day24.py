@@ -10,6 +10,8 @@ Trajectory = tuple[P3D, P3D]
 
 
 class _Problem(ParsedProblem[Trajectory, int], ABC):
+    supports_streaming = True
+
     line_pattern = "{:p3} @ {:p3}"
 
     def __init__(self) -> None:
@@ -1,9 +1,14 @@
 from math import prod
+from typing import TYPE_CHECKING
 
-from igraph import Graph  # type: ignore[import-untyped]
-
+from aoc.lazy import lazy_import
 from aoc.problems import MultiLineProblem
 
+if TYPE_CHECKING:
+    import igraph as ig  # type: ignore[import-untyped]
+else:
+    ig = lazy_import("igraph")
+
 
 class Problem1(MultiLineProblem[int]):
     test_solution = 54
@@ -19,7 +24,7 @@ class Problem1(MultiLineProblem[int]):
         #     vertex_size=6,
         #     layout=graph.layout_fruchterman_reingold(),
         # )
-        return prod(len(c) for c in Graph.ListDict(
+        return prod(len(c) for c in ig.Graph.ListDict(
             {line[:3]: line[5:].split() for line in self.lines},
         ).mincut().partition)
 
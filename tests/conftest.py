@@ -0,0 +1,60 @@
+from contextlib import suppress
+from pathlib import Path
+
+import pytest
+
+from aoc import InputMode
+from aoc.batch import discover
+from aoc.bench.baseline import load_baseline
+
+ROOT = Path(__file__).parent.parent
+# Kept up to date with --check-perf --update-baseline (on the test inputs).
+BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+# Parts that took at least this long (in nanoseconds) in the baseline are marked as slow.
+SLOW = 1_000_000_000
+
+# Parts that don't give the right answer (yet).
+BROKEN = {
+    "test/2019/12/2": "answer is twice the expected one",
+    "test/2019/16/2": "solves to 0",
+    "test/2019/19/1": "Intcode program, there is no test input",
+    "test/2019/19/2": "Intcode program, there is no test input",
+    "test/2021/21/1": "test input isn't parsed into player positions",
+    "test/2021/21/2": "test input isn't parsed into player positions",
+    "test/2022/16/1": "not implemented",
+    "test/2022/19/1": "solves to 0",
+    "test/2023/10/2": "counts 9 enclosed tiles instead of 10",
+}
+
+
+def known_durations() -> dict[str, int]:
+    """Solving times of the parts in the timing baseline (parts that are slow on the test input are on the puzzle too)."""
+    with suppress(OSError, ValueError, KeyError):
+        return load_baseline(BASELINE, InputMode.TEST)
+    return {}
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if not {"input_mode", "data"} <= set(metafunc.fixturenames):
+        return
+    durations = known_durations()
+    metafunc.parametrize(("input_mode", "data"), [
+        pytest.param(
+            input_mode,
+            data,
+            id=(part := f"{input_mode.value}/{data.key}"),
+            marks=[
+                *([pytest.mark.slow] if durations.get(data.key, 0) >= SLOW else []),
+                *([pytest.mark.xfail(reason=BROKEN[part])] if part in BROKEN else []),
+            ],
+        )
+        for input_mode in (InputMode.TEST, InputMode.PUZZLE)
+        for data in discover()
+    ])
+
+
+@pytest.fixture(autouse=True)
+def _root_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Puzzle inputs are looked up relative to the working directory.
+    monkeypatch.chdir(ROOT)
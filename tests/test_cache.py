@@ -0,0 +1,54 @@
+import pickle
+from pathlib import Path
+
+from aoc.cache import AnswerCache, ParseCache
+from aoc.year2021 import day22
+
+
+def test_parse_cache(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path)
+    key = cache.key(day22.Problem1, "input")
+    assert cache.get(key) is None
+    cache.put(key, {"lines": [1, 2, 3]})
+    lines = cache.get(key)
+    assert lines == {"lines": [1, 2, 3]}
+    # Every read is a fresh copy.
+    assert lines is not None
+    lines["lines"] = []
+    assert cache.get(key) == {"lines": [1, 2, 3]}
+    # Stored in the directory for the next run.
+    assert ParseCache(tmp_path).get(key) == {"lines": [1, 2, 3]}
+    assert ParseCache().get(key) is None
+
+
+def test_parse_cache_keys() -> None:
+    key = ParseCache.key(day22.Problem1, "input")
+    # Both parts of the day parse the same way.
+    assert ParseCache.key(day22.Problem2, "input") == key
+    assert ParseCache.key(day22.Problem1, "other input") != key
+
+
+def test_parse_cache_unpicklable() -> None:
+    cache = ParseCache()
+    cache.put("key", {"f": lambda: None})
+    assert cache.get("key") is None
+
+
+def test_answer_cache(tmp_path: Path) -> None:
+    path = tmp_path / "answers.sqlite"
+    cache = AnswerCache(path)
+    key = cache.key(day22.Problem1, "test", "input")
+    assert cache.get(key) is None
+    cache.put(key, 39, [1, 2, 3, 4])
+    assert cache.get(key) == (39, [1, 2, 3, 4])
+    assert AnswerCache(path).get(key) == (39, [1, 2, 3, 4])
+    assert AnswerCache(path, read=False).get(key) is None
+    # Every process opens the database by itself.
+    assert pickle.loads(pickle.dumps(cache)).get(key) == (39, [1, 2, 3, 4])  # noqa: S301 (we pickled it ourselves)
+
+
+def test_answer_cache_keys() -> None:
+    key = AnswerCache.key(day22.Problem1, "test", "input")
+    assert AnswerCache.key(day22.Problem2, "test", "input") != key
+    assert AnswerCache.key(day22.Problem1, "puzzle", "input") != key
+    assert AnswerCache.key(day22.Problem1, "test", "other input") != key
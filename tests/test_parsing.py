@@ -0,0 +1,44 @@
+import parse  # type: ignore[import-untyped]
+import pytest
+
+from aoc.parsing import Converter, Parser
+
+TEXT = """on x=-20..26,y=-36..17,z=-47..7
+off x=-48..-32,y=26..41,z=-47..-37
+on x=967..23432,y=45373..81175,z=27513..53682
+"""
+
+
+def _parse_int(s: str) -> int:
+    return int(s) * 2
+
+
+@pytest.mark.parametrize("pattern", [
+    # Translated to one regex
+    "{:w} x={:d}..{:d},y={:d}..{:d},z={:d}..{:d}\n",
+    "{} x={}..{},{}\n",
+    "{:w} x={:twice}..{:d}{}\n",
+    "x={:d}",
+    "off",
+    # Left to the parse library
+    "{state} x={:d}..{:d}{}\n",
+    "{:w} x={:3d}..{}\n",
+])
+def test_parser_like_parse(pattern: str) -> None:
+    types: dict[str, Converter] = {"twice": _parse_int}
+    expected = [r.fixed for r in parse.findall(pattern, TEXT, extra_types=types)]
+    p = Parser(pattern, types)
+    assert p.findall(TEXT) == expected
+    assert p.findall_buffer(memoryview(TEXT.encode())) == expected
+
+
+def test_translated() -> None:
+    assert Parser("{:w} x={:d}..{:d}\n", {}).regex is not None
+    assert Parser("{state} x={:d}..{:d}\n", {}).regex is None
+
+
+def test_buffer_around_the_lines() -> None:
+    p = Parser("{:w} x={:d}..{}\n", {})
+    expected = p.findall(TEXT)
+    assert p.findall_buffer(memoryview(f"\n\n{TEXT.rstrip()}".encode())) == expected
+    assert p.findall_buffer(memoryview(f"{TEXT}\n \n".encode())) == expected
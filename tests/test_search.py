@@ -0,0 +1,230 @@
+from collections.abc import Iterable
+from typing import NamedTuple, Self
+
+import pytest
+
+from aoc import AOC
+from aoc.search import (
+    AStarState,
+    BFSState,
+    DialState,
+    DijkstraState,
+    PackedSearch,
+    PathMode,
+    SearchStats,
+    ShortestPath,
+    State,
+    distance_maps,
+    path_lengths,
+)
+
+# Risk levels of the example cave of 2021 day 15: the lowest total risk from the top left to the bottom right is 40.
+CAVE = """
+1163751742
+1381373672
+2136511328
+3694931569
+7463417111
+1319128137
+1359912421
+3125421639
+1293138521
+2311944581
+"""
+
+
+class Pos(NamedTuple):
+    x: int
+    y: int
+
+
+class Cave(NamedTuple):
+    risks: dict[Pos, int]
+    goal: Pos
+
+
+def cave(text: str = CAVE) -> Cave:
+    risks = {Pos(x, y): int(c) for y, line in enumerate(text.split()) for x, c in enumerate(line)}
+    return Cave(risks, max(risks))
+
+
+def _neighbours(p: Pos, risks: dict[Pos, int]) -> Iterable[Pos]:
+    for x, y in ((p.x + 1, p.y), (p.x - 1, p.y), (p.x, p.y + 1), (p.x, p.y - 1)):
+        if (q := Pos(x, y)) in risks:
+            yield q
+
+
+class StepState(BFSState[Cave, Pos]):
+    @property
+    def is_finished(self) -> bool:
+        return self.v == self.c.goal
+
+    @property
+    def next_states(self) -> Iterable[Self]:
+        return (self.move(x=q.x, y=q.y) for q in _neighbours(self.v, self.c.risks))
+
+    @property
+    def reverse_states(self) -> Iterable[Self]:
+        return self.next_states
+
+
+class RiskState(DijkstraState[Cave, Pos]):
+    @property
+    def is_finished(self) -> bool:
+        return self.v == self.c.goal
+
+    @property
+    def next_states(self) -> Iterable[Self]:
+        return (self.move(self.c.risks[q], x=q.x, y=q.y) for q in _neighbours(self.v, self.c.risks))
+
+    @property
+    def reverse_states(self) -> Iterable[Self]:
+        # Moving back from a neighbour costs the risk of this position.
+        return (self.move(self.c.risks[self.v], x=q.x, y=q.y) for q in _neighbours(self.v, self.c.risks))
+
+
+class RiskDialState(RiskState, DialState[Cave, Pos]):
+    max_weight = 9
+
+
+class RiskAStarState(RiskState, AStarState[Cave, Pos]):
+    @property
+    def heuristic(self) -> int:
+        return self.c.goal.x - self.v.x + self.c.goal.y - self.v.y
+
+
+class RiskParentsState(RiskState):
+    path_mode = PathMode.PARENTS
+
+
+class RiskNoPathState(RiskState):
+    path_mode = PathMode.NONE
+
+
+def _packed(c: Cave, max_weight: int | None = None) -> PackedSearch:
+    width = c.goal.x + 1
+
+    def expand(n: int) -> Iterable[tuple[int, int]]:
+        return ((q.y * width + q.x, c.risks[q]) for q in _neighbours(Pos(n % width, n // width), c.risks))
+
+    return PackedSearch(len(c.risks), expand, max_weight)
+
+
+def _path_risk(path: ShortestPath[RiskState]) -> int:
+    risks = cave().risks
+    return sum(risks[state.v] for state in path.states[1:])
+
+
+@pytest.mark.parametrize("state_cls", [RiskState, RiskDialState, RiskAStarState, RiskParentsState])
+def test_lowest_risk(state_cls: type[RiskState]) -> None:
+    path = state_cls.find_path(Pos(0, 0), cave())
+    assert path.length == 40
+    assert path.states[0].v == Pos(0, 0)
+    assert path.states[-1].v == Pos(9, 9)
+    assert _path_risk(path) == 40
+
+
+def test_fewest_steps() -> None:
+    path = StepState.find_path(Pos(0, 0), cave())
+    assert path.length == 18
+    assert len(path.states) == 19
+
+
+@pytest.mark.parametrize("state_cls", [StepState, RiskState])
+def test_bidirectional(state_cls: type[State]) -> None:
+    c = cave()
+    path = state_cls.find_path_between([Pos(0, 0)], c.goal, c)
+    assert path.length == state_cls.find_path(Pos(0, 0), c).length
+    assert path.states[0].v == Pos(0, 0)
+    assert path.states[-1].v == c.goal
+
+
+@pytest.mark.parametrize("max_weight", [None, 9])
+def test_packed_search(max_weight: int | None) -> None:
+    c = cave()
+    search = _packed(c, max_weight).find([0], lambda n: n == len(c.risks) - 1)
+    assert search.length == 40
+    assert search.states[0] == 0
+    assert search.states[-1] == len(c.risks) - 1
+
+
+def test_packed_search_max_weight() -> None:
+    with pytest.raises(ValueError, match="not within 5"):
+        _packed(cave(), 5).find([0])
+
+
+def test_path_modes() -> None:
+    full = RiskState.find_path(Pos(0, 0), cave())
+    parents = RiskParentsState.find_path(Pos(0, 0), cave())
+    assert [(s.v, s.cost) for s in parents.states] == [(s.v, s.cost) for s in full.states]
+    # States only know where they came from in PathMode.FULL.
+    assert all(s.prev is None for s in parents.end_state.next_states)
+    none = RiskNoPathState.find_path(Pos(0, 0), cave())
+    assert none.length == 40
+    with pytest.raises(ValueError, match="not recorded"):
+        _ = none.states
+
+
+def test_sources_and_targets() -> None:
+    c = cave()
+    path = RiskState.find_path(None, c, sources=[Pos(0, 0), Pos(9, 0)], targets={Pos(0, 9)})
+    assert path.end_state.v == Pos(0, 9)
+    assert path.length == min(
+        RiskState.find_path(source, c, targets={Pos(0, 9)}).length for source in (Pos(0, 0), Pos(9, 0))
+    )
+
+
+def test_distances() -> None:
+    c = cave()
+    distances = RiskState.distances_from([Pos(0, 0)], c)
+    assert len(distances) == len(c.risks)
+    assert distances[c.goal] == 40
+    assert _packed(c).find([0]).dist.tolist() == [distances[Pos(n % 10, n // 10)] for n in range(len(c.risks))]
+    assert RiskState.distances_from([Pos(0, 0)], c, max_cost=5) == {
+        p: d for p, d in distances.items() if d <= 5
+    }
+
+
+def test_pool_helpers() -> None:
+    c = cave()
+    jobs = [(Pos(0, 0), c), (Pos(9, 0), c), (Pos(0, 9), c)]
+    assert path_lengths(RiskState, jobs) == [RiskState.find_path(v, c).length for v, c in jobs]
+    assert distance_maps(RiskState, jobs, max_cost=10) == [RiskState.distances_from([v], c, 10) for v, c in jobs]
+    assert distance_maps(RiskState, jobs, summarize=len) == [len(c.risks)] * len(jobs)
+
+
+def test_search_stats(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(AOC, "search_stats", [])
+    RiskState.find_path(Pos(0, 0), cave())
+    assert AOC.search_stats is not None
+    (stats,) = AOC.search_stats
+    assert isinstance(stats, SearchStats)
+    assert (stats.engine, stats.state) == ("ShortestPathDijkstra", "RiskState")
+    # The search stops at the goal without expanding it.
+    assert stats.popped == stats.expanded + 1
+    assert stats.expanded == sum(stats.costs.values())
+    # Only the initial state was queued without being generated.
+    assert stats.generated == stats.duplicates + stats.queued - 1
+    assert stats.stale >= 0
+    assert stats.queued >= stats.popped + stats.stale
+    assert stats.max_frontier > 0
+
+
+@pytest.mark.parametrize("max_weight", [None, 9])
+def test_packed_search_stats(max_weight: int | None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(AOC, "search_stats", [])
+    c = cave()
+    _packed(c, max_weight).find([0], lambda n: n == len(c.risks) - 1)
+    _packed(c, max_weight).find([0])
+    assert AOC.search_stats is not None
+    finished, everything = AOC.search_stats
+    assert finished.engine == "PackedSearch"
+    assert finished.popped == finished.expanded + 1
+    assert everything.popped == everything.expanded == len(c.risks)
+    for stats in (finished, everything):
+        assert stats.expanded == sum(stats.costs.values())
+        assert stats.generated == stats.duplicates + stats.queued - 1
+        assert stats.stale >= 0
+        assert stats.max_frontier > 0
+    # Nothing is left in the queue when everything was reached.
+    assert everything.stale == everything.queued - everything.popped
@@ -0,0 +1,17 @@
+from pathlib import Path
+
+from aoc.server import PACKAGE, SolveServer, source_stamps
+
+
+def test_stale() -> None:
+    # Not listening on a socket, just what the server would compare the requests with.
+    server = SolveServer.__new__(SolveServer)
+    stamps = source_stamps()
+    server.stamps = {file: stamps[file] for file in ("cli.py", "search.py")}
+    request = {"package": str(PACKAGE), "sources": stamps}
+    assert server.stale(request) is None
+    edited = {**stamps, "search.py": [stamps["search.py"][0] + 1, stamps["search.py"][1]]}
+    assert server.stale({**request, "sources": edited}) == "has older code of search.py loaded"
+    # Edits to modules that weren't loaded by the server don't matter.
+    assert server.stale({**request, "sources": {**stamps, "year2021/day22.py": [0, 0]}}) is None
+    assert server.stale({**request, "package": str(Path("elsewhere"))}) == f"runs the code in {PACKAGE}"
@@ -0,0 +1,24 @@
+import pytest
+
+from aoc import AOC, InputMode
+from aoc.batch import problem_class
+from aoc.problems import FatalError, Outcome, Problem
+
+
+def test_solution(input_mode: InputMode, data: Problem.Data) -> None:
+    problem_cls = problem_class(data)
+    if problem_cls is None:
+        pytest.skip("part does not exist")
+    AOC.input_mode = input_mode
+    problem_cls.data = data
+    if problem_cls.given_solution() is None:
+        pytest.skip(f"no known solution for {input_mode.value} input")
+    if input_mode == InputMode.PUZZLE:
+        try:
+            problem_cls.read_input()
+        except FatalError:
+            pytest.skip("no puzzle input")
+    result = problem_cls.run(*data)
+    assert result.outcome == Outcome.CORRECT, (
+        result.error or f"{result.outcome.value}: {result.solution!r} instead of {problem_cls.given_solution()!r}"
+    )
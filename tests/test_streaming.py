@@ -0,0 +1,25 @@
+from pathlib import Path
+
+import pytest
+
+from aoc import AOC, InputMode
+from aoc.year2021 import day22
+
+
+@pytest.mark.parametrize("part", [1, 2])
+def test_streamed_input(part: int, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Blank lines around the input, which the unstreamed input leaves out.
+    path = tmp_path / "input.txt"
+    path.write_text(f"\n\n{getattr(day22, f'TEST_INPUT_{part}').strip()}\n \n\n", encoding="utf8")
+    # Only set by AOC.setup().
+    monkeypatch.setattr(AOC, "input_mode", InputMode.TEST, raising=False)
+    monkeypatch.setattr(AOC, "input_path", path)
+    monkeypatch.setattr(AOC, "parse_cache", None)
+    monkeypatch.setattr(AOC, "answer_cache", None)
+    problem_cls = getattr(day22, f"Problem{part}")
+    solutions = []
+    for streaming in (False, True):
+        monkeypatch.setattr(AOC, "streaming_input", streaming)
+        solutions.append(problem_cls.run(2021, 22, part).solution)
+    assert solutions[0] is not None
+    assert solutions[1] == solutions[0]